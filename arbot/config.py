@@ -51,6 +51,7 @@ class ArbitrageConfig:
     max_spread_age_seconds: float = 5.0
     use_dynamic_symbols: bool = True
     max_spread_threshold: float = 1.0  # Maximum spread percentage (100%) to filter out anomalies
+    symbol_cache_ttl_seconds: float = 3600.0  # How long detected symbols are reused across restarts
     
     # Symbol filtering by quote currency
     enabled_quote_currencies: List[str] = field(default_factory=lambda: ["USDT"])  # Enabled quote currencies
@@ -221,6 +222,7 @@ class Config:
                 max_spread_age_seconds=arb_data.get('max_spread_age_seconds', 5.0),
                 use_dynamic_symbols=arb_data.get('use_dynamic_symbols', True),
                 max_spread_threshold=arb_data.get('max_spread_threshold', 1.0),
+                symbol_cache_ttl_seconds=arb_data.get('symbol_cache_ttl_seconds', 3600.0),
                 enabled_quote_currencies=arb_data.get('enabled_quote_currencies', ["USDT"]),
                 available_quote_currencies=arb_data.get('available_quote_currencies', ["USDT", "BUSD", "USDC", "BTC", "ETH", "BNB"]),
                 moving_average_periods=arb_data.get('moving_average_periods', 30),
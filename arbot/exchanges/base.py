@@ -1,8 +1,19 @@
 from abc import ABC, abstractmethod
 from typing import Dict, List, Optional, Tuple, Any
+from collections import deque
 from dataclasses import dataclass
 from enum import Enum
 import asyncio
+import inspect
+import logging
+import sys
+
+import websockets
+
+# Hot-path records drop their per-instance __dict__ where dataclasses support it (3.10+)
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+logger = logging.getLogger(__name__)
 
 
 class OrderSide(Enum):
@@ -23,7 +34,7 @@ class OrderStatus(Enum):
     REJECTED = "rejected"
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Ticker:
     symbol: str
     bid: float
@@ -33,7 +44,7 @@ class Ticker:
     timestamp: float
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class OrderBook:
     symbol: str
     bids: List[Tuple[float, float]]  # (price, size)
@@ -41,7 +52,7 @@ class OrderBook:
     timestamp: float
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Order:
     order_id: str
     symbol: str
@@ -55,7 +66,7 @@ class Order:
     timestamp: Optional[float] = None
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Balance:
     asset: str
     free: float
@@ -72,6 +83,12 @@ class BaseExchange(ABC):
         self.symbols: List[str] = []
         self._callbacks: Dict[str, List[callable]] = {}
         self.exchange_name: str = ""  # Will be set when exchange is created
+        self.exchange_name_lc: str = ""  # Interned lowercase exchange_name, set alongside it
+        # (emit coroutine function, payload) pairs queued by WebSocket read loops and
+        # drained by _emit_consumer; the oldest entries are dropped when full
+        self._emit_queue: deque = deque(maxlen=10000)
+        self._emit_event: Optional[asyncio.Event] = None
+        self._emit_task: Optional[asyncio.Task] = None
     
     @abstractmethod
     async def connect_ws(self, symbols: List[str]) -> None:
@@ -174,6 +191,18 @@ class BaseExchange(ABC):
                         import traceback
                         print(f"Callback traceback: {traceback.format_exc()}")
     
+    async def _emit_tickers(self, tickers: List[Ticker]) -> None:
+        """Emit a batch of ticker updates parsed from one message"""
+        callbacks = self._callbacks.get('ticker')
+        if not callbacks:
+            return
+        for ticker in tickers:
+            for callback in callbacks:
+                try:
+                    await callback(ticker)
+                except Exception as e:
+                    print(f"❌ Error in ticker callback: {e}")
+    
     async def _emit_orderbook(self, orderbook: OrderBook) -> None:
         """Emit orderbook update to registered callbacks"""
         if 'orderbook' in self._callbacks:
@@ -183,6 +212,18 @@ class BaseExchange(ABC):
                 except Exception as e:
                     print(f"Error in orderbook callback: {e}")
     
+    async def _emit_orderbooks(self, orderbooks: List[OrderBook]) -> None:
+        """Emit a batch of orderbook updates parsed from one message"""
+        callbacks = self._callbacks.get('orderbook')
+        if not callbacks:
+            return
+        for orderbook in orderbooks:
+            for callback in callbacks:
+                try:
+                    await callback(orderbook)
+                except Exception as e:
+                    print(f"Error in orderbook callback: {e}")
+    
     async def _emit_order_update(self, order: Order) -> None:
         """Emit order update to registered callbacks"""
         if 'order_update' in self._callbacks:
@@ -192,6 +233,74 @@ class BaseExchange(ABC):
                 except Exception as e:
                     print(f"Error in order update callback: {e}")
     
+    async def _iter_ws_messages(self):
+        """Yield raw frames from self.ws_connection, skipping UTF-8 decoding where supported.
+        
+        With websockets >= 13 text frames are received as bytes (``recv(decode=False)``)
+        and handed straight to the JSON parser, which accepts bytes. Older legacy
+        clients always decode; fall back to plain iteration there.
+        """
+        ws = self.ws_connection
+        if 'decode' not in inspect.signature(ws.recv).parameters:
+            async for message in ws:
+                yield message
+            return
+        
+        try:
+            while True:
+                yield await ws.recv(decode=False)
+        except websockets.exceptions.ConnectionClosedOK:
+            return
+    
+    def _start_emit_consumer(self) -> None:
+        """Run callbacks on their own task so WebSocket read loops go straight back to recv()"""
+        # Reconnects call connect_ws again; keep the consumer that is already running
+        if self._emit_task is not None and not self._emit_task.done():
+            return
+        self._emit_event = asyncio.Event()
+        self._emit_task = asyncio.create_task(self._emit_consumer())
+        if self._emit_queue:
+            self._emit_event.set()
+    
+    async def _stop_emit_consumer(self) -> None:
+        """Cancel the emit task and drop anything still queued"""
+        if self._emit_task:
+            self._emit_task.cancel()
+            try:
+                await self._emit_task
+            except asyncio.CancelledError:
+                pass
+            self._emit_task = None
+        self._emit_queue.clear()
+    
+    def _queue_emit(self, emit: callable, payload: Any) -> None:
+        """Queue emit(payload) for the consumer task without awaiting callbacks"""
+        self._emit_queue.append((emit, payload))
+        # Before connect_ws starts the consumer, updates just wait in the queue
+        if self._emit_event is not None:
+            self._emit_event.set()
+    
+    async def _emit_consumer(self) -> None:
+        """Drain queued updates and dispatch them to registered callbacks"""
+        queue = self._emit_queue
+        event = self._emit_event
+        while True:
+            await event.wait()
+            event.clear()
+            while queue:
+                emit, payload = queue.popleft()
+                if type(payload) is list and queue and queue[0][0] == emit:
+                    # Batches queued back to back for the same emitter go out as one call;
+                    # merged into a new list so the parser's list is left untouched
+                    payload = list(payload)
+                    while queue and queue[0][0] == emit:
+                        payload.extend(queue.popleft()[1])
+                try:
+                    await emit(payload)
+                except Exception:
+                    # Keep consuming: one bad dispatch must not silence every later update
+                    logger.exception(f"Error dispatching {getattr(emit, '__name__', emit)} update")
+    
     @property
     def name(self) -> str:
         """Return the exchange name"""
@@ -4,24 +4,44 @@ import time
 import hmac
 import hashlib
 import logging
+import operator
 from typing import Dict, List, Optional
 from urllib.parse import urlencode
 import aiohttp
 import websockets
+from yarl import URL
 from .base import BaseExchange, Ticker, OrderBook, Order, Balance, OrderSide, OrderType, OrderStatus
 
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is an optional speedup, see requirements.txt
+    json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+# 24hrTicker payload fields in Ticker constructor order, fetched in one C-level call
+_TICKER_FIELDS = operator.itemgetter('s', 'b', 'a', 'B', 'A', 'E')
+
+# Nanoseconds per millisecond, for integer-only request timestamps
+_MS = 1_000_000
+
 
 class BinanceExchange(BaseExchange):
     def __init__(self, api_key: str, api_secret: str, testnet: bool = False):
         super().__init__(api_key, api_secret, testnet)
         self.base_url = "https://testnet.binance.vision" if testnet else "https://api.binance.com"
-        self.ws_url = "wss://testnet.binance.vision/ws" if testnet else "wss://stream.binance.com:9443/ws"
+        # Combined-stream endpoint; streams are added with a SUBSCRIBE message after connecting
+        self.ws_url = "wss://testnet.binance.vision/stream" if testnet else "wss://stream.binance.com:9443/stream"
         self.session: Optional[aiohttp.ClientSession] = None
         self.ws_connection: Optional[websockets.WebSocketServerProtocol] = None
         self._ws_task: Optional[asyncio.Task] = None
+        self._ws_subscribe_msg: Optional[str] = None  # Built once in connect_ws, reused on reconnect
         self._server_time_offset = 0
+        self._api_secret_bytes = (api_secret or '').encode('utf-8')  # HMAC key, encoded once
+        # All-symbol bookTicker snapshot shared by get_tickers() callers within its TTL
+        self._book_tickers: Dict[str, Ticker] = {}
+        self._book_tickers_at = 0.0
+        self._book_tickers_lock: Optional[asyncio.Lock] = None  # Created on first use, inside the running loop
     
     async def _get_session(self) -> aiohttp.ClientSession:
         if self.session is None or self.session.closed:
@@ -30,20 +50,26 @@ class BinanceExchange(BaseExchange):
     
     def _generate_signature(self, query_string: str) -> str:
         return hmac.new(
-            self.api_secret.encode('utf-8'),
+            self._api_secret_bytes,
             query_string.encode('utf-8'),
             hashlib.sha256
         ).hexdigest()
     
+    def _signed_query(self, params: Dict) -> str:
+        """Stamp params and return the exact query string that was signed"""
+        params['timestamp'] = (time.time_ns() // _MS) + self._server_time_offset
+        query_string = urlencode(params)
+        return f"{query_string}&signature={self._generate_signature(query_string)}"
+    
     async def _sync_server_time(self) -> None:
         """Synchronize with Binance server time to avoid timestamp errors"""
         try:
             session = await self._get_session()
             async with session.get(f"{self.base_url}/api/v3/time") as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = await response.json(loads=json_loads)
                     server_time = data['serverTime']
-                    local_time = int(time.time() * 1000)
+                    local_time = time.time_ns() // _MS
                     self._server_time_offset = server_time - local_time
         except Exception as e:
             print(f"Failed to sync server time: {e}")
@@ -56,35 +82,29 @@ class BinanceExchange(BaseExchange):
         
         if params is None:
             params = {}
+        request_url, request_params = url, params
         
         if signed:
             # Sync server time on first signed request or if previous requests failed
             if self._server_time_offset == 0:
                 await self._sync_server_time()
             
-            timestamp = int(time.time() * 1000) + self._server_time_offset
-            params['timestamp'] = timestamp
-            query_string = urlencode(params)
-            signature = self._generate_signature(query_string)
-            params['signature'] = signature
+            # Signed params travel in the URL as-is so the wire bytes match the signature
+            request_url, request_params = URL(f"{url}?{self._signed_query(params)}", encoded=True), None
         
         headers = {'X-MBX-APIKEY': self.api_key} if self.api_key else {}
         
         try:
-            async with session.request(method, url, params=params, headers=headers) as response:
-                data = await response.json()
+            async with session.request(method, request_url, params=request_params, headers=headers) as response:
+                data = await response.json(loads=json_loads)
                 if response.status != 200:
                     # If timestamp error, try to resync and retry once
                     if data.get('code') == -1021 and signed:
                         await self._sync_server_time()
-                        timestamp = int(time.time() * 1000) + self._server_time_offset
-                        params['timestamp'] = timestamp
-                        query_string = urlencode(params)
-                        signature = self._generate_signature(query_string)
-                        params['signature'] = signature
+                        request_url = URL(f"{url}?{self._signed_query(params)}", encoded=True)
                         
-                        async with session.request(method, url, params=params, headers=headers) as retry_response:
-                            retry_data = await retry_response.json()
+                        async with session.request(method, request_url, headers=headers) as retry_response:
+                            retry_data = await retry_response.json(loads=json_loads)
                             if retry_response.status != 200:
                                 raise Exception(f"Binance API error: {retry_data}")
                             return retry_data
@@ -114,31 +134,35 @@ class BinanceExchange(BaseExchange):
             # Only use ticker stream to reduce connection load
             # stream_names.append(f"{symbol_lower}@depth5")
         
-        stream_url = f"{self.ws_url}/{'/'.join(stream_names)}"
+        # Streams go in a SUBSCRIBE message rather than the URL path, which avoids
+        # URL length limits and lets reconnects reuse the same payload
+        self._ws_subscribe_msg = json.dumps({
+            "method": "SUBSCRIBE",
+            "params": stream_names,
+            "id": 1
+        })
         
-        # Debug: Log WebSocket URL and stream configuration
-        logger.info(f"Binance WebSocket URL length: {len(stream_url)} characters")
-        logger.info(f"Binance WebSocket URL: {stream_url[:200]}{'...' if len(stream_url) > 200 else ''}")
         logger.info(f"Binance subscribing to {len(stream_names)} streams for {len(symbols)} symbols")
         logger.info(f"First few streams: {stream_names[:5]}")
         
-        # Check if URL is too long (Binance has limits)
-        if len(stream_url) > 8000:  # Conservative limit
-            logger.warning(f"⚠️ Binance WebSocket URL is very long ({len(stream_url)} chars), may cause connection issues")
-        
         try:
             self.ws_connection = await websockets.connect(
-                stream_url,
+                self.ws_url,
                 ping_interval=20,  # 표준화된 ping 간격
                 ping_timeout=10,   # 표준화된 ping 타임아웃
-                close_timeout=10   # 표준화된 종료 타임아웃
+                close_timeout=10,  # 표준화된 종료 타임아웃
+                compression=None   # 작은 JSON 프레임이라 permessage-deflate 해제
             )
+            await self.ws_connection.send(self._ws_subscribe_msg)
             self.connected = True
             
             # Show subscription completion message like Bybit
             print(f"✅ Binance 구독 완료: {len(symbols)}개 심볼 (총 {len(stream_names)}개 채널)")
             logger.info(f"✅ Binance WebSocket connected with {len(symbols)} symbols and {len(stream_names)} streams")
             
+            # Callbacks run on their own task so the read loop goes straight back to recv()
+            self._start_emit_consumer()
+            
             # Start with simple message handling first, add reconnection later if needed
             logger.info("🔄 About to start Binance WebSocket message handler task...")
             self._ws_task = asyncio.create_task(self._handle_ws_messages())
@@ -166,6 +190,8 @@ class BinanceExchange(BaseExchange):
                 pass
             self._ws_task = None
         
+        await self._stop_emit_consumer()
+        
         if self.ws_connection:
             try:
                 await self.ws_connection.close()
@@ -187,19 +213,14 @@ class BinanceExchange(BaseExchange):
             try:
                 # If this is a reconnection attempt, recreate the WebSocket connection
                 if retry_count > 0:
-                    stream_names = []
-                    for symbol in self.symbols:
-                        symbol_lower = symbol.lower()
-                        stream_names.append(f"{symbol_lower}@ticker")
-                    
-                    stream_url = f"{self.ws_url}/{'/'.join(stream_names)}"
-                    
                     self.ws_connection = await websockets.connect(
-                        stream_url,
+                        self.ws_url,
                         ping_interval=20,
                         ping_timeout=10,
-                        close_timeout=10
+                        close_timeout=10,
+                        compression=None
                     )
+                    await self.ws_connection.send(self._ws_subscribe_msg)
                     logger.info(f"Binance WebSocket reconnected successfully (attempt {retry_count})")
                 
                 # Reset retry count on successful connection
@@ -207,12 +228,12 @@ class BinanceExchange(BaseExchange):
                 self.connected = True
                 
                 # Process messages
-                async for message in self.ws_connection:
+                async for message in self._iter_ws_messages():
                     if not self.connected:
                         break
                         
                     try:
-                        data = json.loads(message)
+                        data = json_loads(message)
                         
                         if 'stream' in data:
                             stream = data['stream']
@@ -280,7 +301,7 @@ class BinanceExchange(BaseExchange):
         message_count = 0
         try:
             logger.info("📡 Starting to listen for Binance WebSocket messages...")
-            async for message in self.ws_connection:
+            async for message in self._iter_ws_messages():
                 message_count += 1
                 
                 if message_count <= 3:
@@ -293,7 +314,7 @@ class BinanceExchange(BaseExchange):
                     break
                     
                 try:
-                    data = json.loads(message)
+                    data = json_loads(message)
                     
                     # Debug: Log message structure for first few messages
                     if message_count <= 3:
@@ -343,6 +364,14 @@ class BinanceExchange(BaseExchange):
                         
                         await self._handle_ticker_data(data)
                     
+                    elif 'id' in data:
+                        # SUBSCRIBE reply: {'result': None, 'id': 1} or {'error': {...}, 'id': 1}
+                        if data.get('error'):
+                            logger.error(f"❌ Binance subscription error: {data['error']}")
+                            print(f"❌ Binance 구독 실패: {data['error']}")
+                        else:
+                            logger.info(f"Binance subscription acknowledged (id: {data['id']})")
+                    
                     else:
                         # Unknown message format
                         if message_count <= 3:
@@ -375,29 +404,23 @@ class BinanceExchange(BaseExchange):
         if self._ticker_data_debug_count <= 2:
             logger.info(f"🎯 Binance _handle_ticker_data #{self._ticker_data_debug_count}: {data.get('s')} = {data.get('b')}/{data.get('a')}")
         
-        ticker = Ticker(
-            symbol=data['s'],
-            bid=float(data['b']),
-            ask=float(data['a']),
-            bid_size=float(data['B']),
-            ask_size=float(data['A']),
-            timestamp=float(data['E']) / 1000
-        )
+        symbol, bid, ask, bid_size, ask_size, event_time = _TICKER_FIELDS(data)
+        # Event times are integer milliseconds; true division yields the float seconds
+        # Ticker.timestamp is defined in, without an extra float() round trip
+        ticker = Ticker(symbol, float(bid), float(ask), float(bid_size), float(ask_size),
+                        event_time / 1000)
         
-        if self._ticker_data_debug_count <= 2:
-            logger.info(f"🚀 Binance about to emit ticker #{self._ticker_data_debug_count}: {ticker.symbol}")
-            
-        await self._emit_ticker(ticker)
+        self._queue_emit(self._emit_ticker, ticker)
         
         if self._ticker_data_debug_count <= 2:
-            logger.info(f"✅ Binance ticker #{self._ticker_data_debug_count} emitted successfully")
+            logger.info(f"✅ Binance ticker #{self._ticker_data_debug_count} queued for emit: {ticker.symbol}")
     
     async def _handle_depth_data(self, data: Dict) -> None:
         orderbook = OrderBook(
             symbol=data['s'],
             bids=[(float(price), float(size)) for price, size in data['bids']],
             asks=[(float(price), float(size)) for price, size in data['asks']],
-            timestamp=float(data['E']) / 1000
+            timestamp=data['E'] / 1000
         )
         await self._emit_orderbook(orderbook)
     
@@ -412,6 +435,24 @@ class BinanceExchange(BaseExchange):
             timestamp=time.time()
         )
     
+    async def get_tickers(self, symbols: List[str], max_age: float = 1.0) -> Dict[str, Ticker]:
+        """Get tickers for many symbols from one cached all-symbol bookTicker request"""
+        if self._book_tickers_lock is None:
+            self._book_tickers_lock = asyncio.Lock()
+        async with self._book_tickers_lock:
+            if time.monotonic() - self._book_tickers_at >= max_age:
+                data = await self._make_request('GET', '/api/v3/ticker/bookTicker')
+                now = time.time()
+                self._book_tickers = {
+                    item['symbol']: Ticker(item['symbol'], float(item['bidPrice']), float(item['askPrice']),
+                                           float(item['bidQty']), float(item['askQty']), now)
+                    for item in data
+                }
+                self._book_tickers_at = time.monotonic()
+        
+        book_tickers = self._book_tickers
+        return {symbol: book_tickers[symbol] for symbol in symbols if symbol in book_tickers}
+    
     async def get_orderbook(self, symbol: str, limit: int = 100) -> OrderBook:
         data = await self._make_request('GET', '/api/v3/depth', {'symbol': symbol, 'limit': limit})
         return OrderBook(
@@ -445,7 +486,7 @@ class BinanceExchange(BaseExchange):
             price=float(data['price']) if data['price'] != '0.00000000' else None,
             status=self._map_order_status(data['status']),
             filled_quantity=float(data['executedQty']),
-            timestamp=float(data['transactTime']) / 1000
+            timestamp=data['transactTime'] / 1000
         )
     
     async def cancel_order(self, order_id: str, symbol: str) -> bool:
@@ -470,7 +511,7 @@ class BinanceExchange(BaseExchange):
             status=self._map_order_status(data['status']),
             filled_quantity=float(data['executedQty']),
             average_price=float(data['cummulativeQuoteQty']) / float(data['executedQty']) if float(data['executedQty']) > 0 else None,
-            timestamp=float(data['time']) / 1000
+            timestamp=data['time'] / 1000
         )
     
     async def get_balance(self, asset: Optional[str] = None) -> Dict[str, Balance]:
@@ -2,7 +2,6 @@ import asyncio
 import json
 import time
 import hmac
-import hashlib
 import base64
 import logging
 from typing import Dict, List, Optional
@@ -11,8 +10,35 @@ import aiohttp
 import websockets
 from .base import BaseExchange, Ticker, OrderBook, Order, Balance, OrderSide, OrderType, OrderStatus
 
+try:
+    import orjson
+    json_loads = orjson.loads
+
+    def json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode('utf-8')
+except ImportError:  # orjson is an optional speedup, see requirements.txt
+    json_loads = json.loads
+    json_dumps = json.dumps
+
 logger = logging.getLogger(__name__)
 
+# Nanoseconds per millisecond, for integer-only request timestamps
+_MS = 1_000_000
+
+# aiohttp copies request headers, so the shared dicts below are never mutated
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# Seconds a get_symbols() result is reused before refetching
+_SYMBOLS_CACHE_TTL = 300
+
+_BITGET_STATUS_MAP = {
+    'new': OrderStatus.NEW,
+    'partial_fill': OrderStatus.PARTIALLY_FILLED,
+    'full_fill': OrderStatus.FILLED,
+    'cancelled': OrderStatus.CANCELED,
+    'rejected': OrderStatus.REJECTED
+}
+
 
 class BitgetExchange(BaseExchange):
     def __init__(self, api_key: str, api_secret: str, testnet: bool = False, passphrase: str = ""):
@@ -24,22 +50,52 @@ class BitgetExchange(BaseExchange):
         self.ws_connection: Optional[websockets.WebSocketServerProtocol] = None
         self._ws_task: Optional[asyncio.Task] = None
         self._server_time_offset = 0
+        self._api_secret_bytes = (api_secret or '').encode('utf-8')  # HMAC key, encoded once
+        # Static part of every signed request's headers; only sign/timestamp vary per call
+        self._signed_headers_base = {
+            **_JSON_HEADERS,
+            'ACCESS-KEY': api_key,
+            'ACCESS-PASSPHRASE': passphrase,
+            'locale': 'en-US'
+        }
+        self._sub_frames: List[tuple] = []  # (serialized subscribe frame, batch symbols)
+        self._symbol_set: frozenset = frozenset()  # Symbols subscribed by connect_ws
+        self._symbols_cache: List[str] = []
+        self._symbols_cache_ts = 0.0
+        # WS channel -> (per-item parser, batch emitter), looked up once per frame
+        self._dispatch = {
+            'ticker': (self._handle_ticker_data, self._emit_tickers),
+            'books5': (self._handle_orderbook_data, self._emit_orderbooks)
+        }
     
     async def _get_session(self) -> aiohttp.ClientSession:
         if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession()
+            # One long-lived pool: keep-alive reuse avoids a TLS handshake per REST burst
+            connector = aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=32,
+                ttl_dns_cache=300,
+                keepalive_timeout=75,
+                enable_cleanup_closed=True
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                cookie_jar=aiohttp.DummyCookieJar(),  # Auth is header-based; no cookies to track
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
         return self.session
     
     def _generate_signature(self, timestamp: str, method: str, request_path: str, body: str = "") -> str:
         message = timestamp + method + request_path + body
+        # One-shot hmac.digest stays in OpenSSL instead of building an HMAC object
         signature = base64.b64encode(
-            hmac.new(
-                self.api_secret.encode('utf-8'),
+            hmac.digest(
+                self._api_secret_bytes,
                 message.encode('utf-8'),
-                hashlib.sha256
-            ).digest()
+                'sha256'
+            )
         )
-        return signature.decode('utf-8')
+        return signature.decode('ascii')
     
     async def _make_request(self, method: str, endpoint: str, params: Optional[Dict] = None, 
                           signed: bool = False) -> Dict:
@@ -49,43 +105,37 @@ class BitgetExchange(BaseExchange):
         if params is None:
             params = {}
         
-        headers = {
-            'Content-Type': 'application/json'
-        }
+        headers = _JSON_HEADERS
         
         request_path = endpoint
+        request_params = {}
         body = ""
         
+        if method == 'GET':
+            if params:
+                if signed:
+                    query_string = urlencode(params)
+                    request_path += f"?{query_string}"
+                    url += f"?{query_string}"
+                else:
+                    request_params['params'] = params
+        elif params:
+            # Serialized once: these exact bytes are signed and sent, so aiohttp never re-encodes
+            body = json_dumps(params)
+            request_params['data'] = body.encode('utf-8')
+        
         if signed:
-            timestamp = str(int(time.time() * 1000))
-            
-            if method == 'GET' and params:
-                query_string = urlencode(params)
-                request_path += f"?{query_string}"
-                url += f"?{query_string}"
-            elif method in ['POST', 'PUT', 'DELETE'] and params:
-                body = json.dumps(params)
-            
+            timestamp = str(time.time_ns() // _MS)
             signature = self._generate_signature(timestamp, method, request_path, body)
             
-            headers.update({
-                'ACCESS-KEY': self.api_key,
+            headers = {
+                **self._signed_headers_base,
                 'ACCESS-SIGN': signature,
-                'ACCESS-TIMESTAMP': timestamp,
-                'ACCESS-PASSPHRASE': self.passphrase,
-                'locale': 'en-US'
-            })
-        
-        request_params = {}
-        if method == 'GET':
-            if not signed:
-                request_params['params'] = params
-        else:
-            if params:
-                request_params['data'] = body if signed else json.dumps(params)
+                'ACCESS-TIMESTAMP': timestamp
+            }
         
         async with session.request(method, url, headers=headers, **request_params) as response:
-            data = await response.json()
+            data = await response.json(loads=json_loads)
             if data.get('code') != '00000':
                 raise Exception(f"Bitget API error: {data}")
             return data
@@ -93,14 +143,25 @@ class BitgetExchange(BaseExchange):
     async def connect_ws(self, symbols: List[str]) -> None:
         self.symbols = symbols
         
-        # Validate symbols against Bitget's available symbols first
-        try:
-            print(f"🔍 Bitget: Validating {len(symbols)} symbols...")
-            valid_symbols = await self._validate_symbols(symbols)
+        # Symbol validation (REST) and the WebSocket handshake are independent, so run them together
+        print(f"🔍 Bitget: Validating {len(symbols)} symbols...")
+        valid_symbols, connection = await asyncio.gather(
+            self._validate_symbols(symbols),
+            websockets.connect(
+                self.ws_url,
+                compression=None,  # 작은 JSON 프레임이라 permessage-deflate 해제
+                max_size=2**22,    # 큰 스냅샷 프레임으로 연결이 끊기지 않도록
+                ping_interval=20,
+                ping_timeout=20
+            ),
+            return_exceptions=True
+        )
+        
+        if isinstance(valid_symbols, Exception):
+            logger.warning(f"Failed to validate Bitget symbols: {valid_symbols}, using original list")
+        else:
             print(f"✅ Bitget: {len(valid_symbols)} valid symbols out of {len(symbols)}")
             symbols = valid_symbols
-        except Exception as e:
-            logger.warning(f"Failed to validate Bitget symbols: {e}, using original list")
         
         # Limit symbols for Bitget to avoid overwhelming the connection
         max_symbols_per_connection = 50  # Reduced limit for batch subscription
@@ -111,8 +172,16 @@ class BitgetExchange(BaseExchange):
             symbols = symbols[:max_symbols_per_connection]
             self.symbols = symbols
         
+        # Handlers drop frames for anything outside the final subscription list
+        self._symbol_set = frozenset(symbols)
+        
+        if isinstance(connection, Exception):
+            print(f"Failed to connect to Bitget WebSocket: {connection}")
+            self.connected = False
+            return
+        
         try:
-            self.ws_connection = await websockets.connect(self.ws_url)
+            self.ws_connection = connection
             self.connected = True
             
             # Subscribe using batch subscription to avoid rate limits
@@ -121,6 +190,7 @@ class BitgetExchange(BaseExchange):
             await self._subscribe_batch(symbols)
             
             print(f"✅ Bitget 구독 완료: {len(symbols)}개 심볼")
+            self._start_emit_consumer()
             self._ws_task = asyncio.create_task(self._handle_ws_messages())
         except Exception as e:
             print(f"Failed to connect to Bitget WebSocket: {e}")
@@ -131,7 +201,7 @@ class BitgetExchange(BaseExchange):
             "op": "subscribe",
             "args": [f"ticker:{symbol}"]
         }
-        await self.ws_connection.send(json.dumps(subscribe_msg))
+        await self.ws_connection.send(json_dumps(subscribe_msg))
     
     async def _validate_symbols(self, symbols: List[str]) -> List[str]:
         """Validate symbols against Bitget's available symbols using REST API"""
@@ -152,40 +222,24 @@ class BitgetExchange(BaseExchange):
             logger.error(f"Failed to validate Bitget symbols: {e}")
             return symbols  # Return original list if validation fails
     
-    def _convert_to_bitget_symbol(self, symbol: str) -> str:
-        """Convert standard symbol format to Bitget format"""
-        # Bitget might use different formats for WebSocket vs REST
-        # For now, return as is, but this can be extended if needed
-        return symbol
+    def _build_sub_frames(self, symbols: List[str], batch_size: int = 20) -> List[tuple]:
+        """Serialize ticker+books5 subscription frames once per symbol batch"""
+        # Bitget WS uses the REST symbol format, so "channel:SYMBOL" args need no conversion
+        frames = []
+        for i in range(0, len(symbols), batch_size):
+            batch_symbols = symbols[i:i + batch_size]
+            args = [f"{channel}:{symbol}" for symbol in batch_symbols for channel in ("ticker", "books5")]
+            frames.append((json_dumps({"op": "subscribe", "args": args}), batch_symbols))
+        return frames
     
     async def _subscribe_batch(self, symbols: List[str]) -> None:
         """Subscribe to multiple symbols in batches to avoid rate limits"""
-        # Bitget supports batch subscription with multiple channels
-        # Split into smaller batches to avoid request size limits
-        batch_size = 10  # Conservative batch size
+        # Frames are built once and kept on the instance so they can be resent without rebuilding
+        self._sub_frames = self._build_sub_frames(symbols)
         
-        for i in range(0, len(symbols), batch_size):
-            batch_symbols = symbols[i:i + batch_size]
-            
-            # Create batch subscription for both ticker and orderbook
-            # According to Bitget API docs, the format should be channel:symbol
-            args = []
-            for symbol in batch_symbols:
-                # Convert symbol to Bitget format if needed
-                bitget_symbol = self._convert_to_bitget_symbol(symbol)
-                
-                # Add ticker channel - format: "ticker:SYMBOL"
-                args.append(f"ticker:{bitget_symbol}")
-                # Add orderbook channel - format: "books5:SYMBOL"
-                args.append(f"books5:{bitget_symbol}")
-            
-            subscribe_msg = {
-                "op": "subscribe",
-                "args": args
-            }
-            
+        for frame, batch_symbols in self._sub_frames:
             try:
-                await self.ws_connection.send(json.dumps(subscribe_msg))
+                await self.ws_connection.send(frame)
                 logger.info(f"Bitget: Sent batch subscription for {len(batch_symbols)} symbols")
                 
                 # Add delay between batches to prevent rate limiting
@@ -196,9 +250,8 @@ class BitgetExchange(BaseExchange):
                 # Fallback to individual subscriptions for this batch
                 for symbol in batch_symbols:
                     try:
-                        bitget_symbol = self._convert_to_bitget_symbol(symbol)
-                        await self._subscribe_ticker(bitget_symbol)
-                        await self._subscribe_orderbook(bitget_symbol)
+                        await self._subscribe_ticker(symbol)
+                        await self._subscribe_orderbook(symbol)
                         await asyncio.sleep(0.1)
                     except Exception as sub_e:
                         logger.warning(f"Failed to subscribe to {symbol}: {sub_e}")
@@ -208,7 +261,7 @@ class BitgetExchange(BaseExchange):
             "op": "subscribe",
             "args": [f"books5:{symbol}"]
         }
-        await self.ws_connection.send(json.dumps(subscribe_msg))
+        await self.ws_connection.send(json_dumps(subscribe_msg))
     
     async def disconnect_ws(self) -> None:
         if self._ws_task:
@@ -218,6 +271,8 @@ class BitgetExchange(BaseExchange):
             except asyncio.CancelledError:
                 pass
         
+        await self._stop_emit_consumer()
+        
         if self.ws_connection:
             await self.ws_connection.close()
             self.ws_connection = None
@@ -225,57 +280,28 @@ class BitgetExchange(BaseExchange):
         self.connected = False
     
     async def _handle_ws_messages(self) -> None:
+        dispatch = self._dispatch
         try:
             async for message in self.ws_connection:
                 try:
-                    data = json.loads(message)
+                    # Control frames are recognised on the raw text so market data is the only full parse
+                    if message == 'pong':
+                        continue
+                    if '"event"' in message:
+                        self._handle_ws_event(json_loads(message))
+                        continue
                     
-                    if 'data' in data and 'arg' in data:
-                        channel = data['arg']['channel']
-                        
-                        if channel == 'ticker':
-                            for ticker_data in data['data']:
-                                await self._handle_ticker_data(ticker_data)
-                        elif channel == 'books5':
-                            for orderbook_data in data['data']:
-                                await self._handle_orderbook_data(orderbook_data)
-                    elif 'event' in data:
-                        if data['event'] == 'subscribe':
-                            # Extract readable info from subscription response
-                            arg = data.get('arg', 'unknown')
-                            if isinstance(arg, str) and ':' in arg:
-                                channel, inst_id = arg.split(':', 1)
-                                print(f"✅ Bitget {channel} 구독: {inst_id}")
-                            else:
-                                print(f"✅ Bitget 구독: {arg}")
-                        elif data['event'] == 'error':
-                            # More detailed error handling
-                            error_msg = data.get('msg', 'Unknown error')
-                            error_code = data.get('code', 'Unknown code')
-                            arg = data.get('arg', {})
-                            
-                            # Check if it's a symbol existence error
-                            if "doesn't exist" in error_msg:
-                                # arg is now a string in format "channel:symbol"
-                                arg = data.get('arg', 'unknown')
-                                if isinstance(arg, str) and ':' in arg:
-                                    channel, inst_id = arg.split(':', 1)
-                                    logger.warning(f"Bitget symbol not found: {inst_id} (channel: {channel})")
-                                else:
-                                    logger.warning(f"Bitget symbol not found: {arg}")
-                                # Don't print these errors to console to reduce noise
-                            elif error_code == '30016':  # param error
-                                print(f"⚠️ Bitget param error: {error_msg}")
-                                logger.warning(f"Bitget parameter error: {error_msg}")
-                                # Log the problematic subscription for debugging
-                                arg = data.get('arg', 'unknown')
-                                if arg:
-                                    logger.warning(f"Problematic subscription: {arg}")
-                            else:
-                                print(f"❌ Bitget 오류 ({error_code}): {error_msg}")
-                    else:
-                        # Silently ignore other messages
-                        pass
+                    data = json_loads(message)
+                    if 'data' in data:
+                        arg = data.get('arg')
+                        if arg:
+                            route = dispatch.get(arg['channel'])
+                            if route:
+                                # Parse every entry first, then hand the whole frame to callbacks at once
+                                parse, emit = route
+                                parsed = [obj for obj in map(parse, data['data']) if obj is not None]
+                                if parsed:
+                                    self._queue_emit(emit, parsed)
                         
                 except json.JSONDecodeError as e:
                     print(f"Failed to parse Bitget WebSocket message: {e}, message: {message}")
@@ -286,62 +312,96 @@ class BitgetExchange(BaseExchange):
             print(f"Bitget WebSocket connection error: {e}")
             self.connected = False
     
-    async def _handle_ticker_data(self, data: Dict) -> None:
+    def _handle_ws_event(self, data: Dict) -> None:
+        """Report subscribe acks and errors (off the market-data path)"""
+        if data['event'] == 'subscribe':
+            # Extract readable info from subscription response
+            arg = data.get('arg', 'unknown')
+            if isinstance(arg, str) and ':' in arg:
+                channel, inst_id = arg.split(':', 1)
+                print(f"✅ Bitget {channel} 구독: {inst_id}")
+            else:
+                print(f"✅ Bitget 구독: {arg}")
+        elif data['event'] == 'error':
+            # More detailed error handling
+            error_msg = data.get('msg', 'Unknown error')
+            error_code = data.get('code', 'Unknown code')
+            
+            # Check if it's a symbol existence error
+            if "doesn't exist" in error_msg:
+                # arg is now a string in format "channel:symbol"
+                arg = data.get('arg', 'unknown')
+                if isinstance(arg, str) and ':' in arg:
+                    channel, inst_id = arg.split(':', 1)
+                    logger.warning(f"Bitget symbol not found: {inst_id} (channel: {channel})")
+                else:
+                    logger.warning(f"Bitget symbol not found: {arg}")
+                # Don't print these errors to console to reduce noise
+            elif error_code == '30016':  # param error
+                print(f"⚠️ Bitget param error: {error_msg}")
+                logger.warning(f"Bitget parameter error: {error_msg}")
+                # Log the problematic subscription for debugging
+                arg = data.get('arg', 'unknown')
+                if arg:
+                    logger.warning(f"Problematic subscription: {arg}")
+            else:
+                print(f"❌ Bitget 오류 ({error_code}): {error_msg}")
+    
+    def _handle_ticker_data(self, data: Dict) -> Optional[Ticker]:
         try:
+            get = data.get  # Bound once; the payload shape varies, so keys stay optional
+            
             # Get symbol from either instId or symbol field
-            symbol = data.get('instId') or data.get('symbol')
+            symbol = get('instId') or get('symbol')
             if not symbol:
                 return  # Silently skip if no symbol
+            if self._symbol_set and symbol not in self._symbol_set:
+                return  # Not subscribed here; skip before any float parsing
             
             # Use bidPr/askPr if available, otherwise use lastPr
-            bid_price = data.get('bidPr')
-            ask_price = data.get('askPr')
-            last_price = data.get('lastPr') or data.get('lastPrice')
+            bid_price = get('bidPr')
+            ask_price = get('askPr')
             
             if bid_price and ask_price:
                 bid = float(bid_price)
                 ask = float(ask_price)
-            elif last_price:
-                # Use lastPrice as both bid and ask if bid/ask not available
-                last = float(last_price)
-                bid = last * 0.9999  # Slightly lower for bid
-                ask = last * 1.0001  # Slightly higher for ask
             else:
-                return  # Skip if no price data available
+                # Last price is only looked up when the book top is missing
+                last_price = get('lastPr') or get('lastPrice')
+                if not last_price:
+                    return  # Skip if no price data available
+                # Use lastPrice as both bid and ask if bid/ask not available (no synthetic spread)
+                bid = ask = float(last_price)
             
-            ticker = Ticker(
-                symbol=symbol,
-                bid=bid,
-                ask=ask,
-                bid_size=float(data.get('bidSz', 0)),
-                ask_size=float(data.get('askSz', 0)),
-                timestamp=float(data.get('ts', time.time() * 1000)) / 1000
-            )
-            await self._emit_ticker(ticker)
+            ts = get('ts')
+            return Ticker(symbol, bid, ask, float(get('bidSz', 0)), float(get('askSz', 0)),
+                          float(ts) / 1000 if ts is not None else time.time())
         except (KeyError, ValueError, TypeError) as e:
             print(f"Error processing Bitget ticker data: {e}, data: {data}")
     
-    async def _handle_orderbook_data(self, data: Dict) -> None:
+    def _handle_orderbook_data(self, data: Dict) -> Optional[OrderBook]:
         try:
-            # Bitget uses different field names: symbol, bids, asks
-            required_fields = ['bids', 'asks']
-            if not all(key in data for key in required_fields):
-                # Missing required fields - skip silently
-                return
-            
             # Determine symbol field - could be 'symbol' or 'instId'
             symbol = data.get('symbol') or data.get('instId')
             if not symbol:
                 # No symbol info available - skip silently
                 return
+            if self._symbol_set and symbol not in self._symbol_set:
+                return  # Not subscribed here; skip before any float parsing
             
-            orderbook = OrderBook(
+            # Bitget uses different field names: symbol, bids, asks
+            required_fields = ['bids', 'asks']
+            if not all(key in data for key in required_fields):
+                # Missing required fields - skip silently
+                return
+            
+            return OrderBook(
                 symbol=symbol,
-                bids=[(float(bid[0]), float(bid[1])) for bid in data['bids'] if len(bid) >= 2],
-                asks=[(float(ask[0]), float(ask[1])) for ask in data['asks'] if len(ask) >= 2],
-                timestamp=float(data.get('ts', time.time() * 1000)) / 1000
+                # Levels are always [price, size]; unpacking beats indexing plus a len() guard
+                bids=[(float(price), float(size)) for price, size in data['bids']],
+                asks=[(float(price), float(size)) for price, size in data['asks']],
+                timestamp=float(data['ts']) / 1000 if 'ts' in data else time.time()
             )
-            await self._emit_orderbook(orderbook)
         except (KeyError, ValueError, TypeError, IndexError) as e:
             print(f"Error processing Bitget orderbook data: {e}, data: {data}")
     
@@ -364,8 +424,8 @@ class BitgetExchange(BaseExchange):
         orderbook_data = data['data']
         return OrderBook(
             symbol=symbol,
-            bids=[(float(bid[0]), float(bid[1])) for bid in orderbook_data['bids']],
-            asks=[(float(ask[0]), float(ask[1])) for ask in orderbook_data['asks']],
+            bids=[(float(price), float(size)) for price, size in orderbook_data['bids']],
+            asks=[(float(price), float(size)) for price, size in orderbook_data['asks']],
             timestamp=float(orderbook_data['ts']) / 1000
         )
     
@@ -449,6 +509,10 @@ class BitgetExchange(BaseExchange):
         }
     
     async def get_symbols(self) -> List[str]:
+        # Product listings change rarely; reuse the last fetch within the TTL
+        if self._symbols_cache and time.monotonic() - self._symbols_cache_ts < _SYMBOLS_CACHE_TTL:
+            return list(self._symbols_cache)
+        
         try:
             data = await self._make_request('GET', '/api/spot/v1/public/products')
             symbols = []
@@ -462,7 +526,9 @@ class BitgetExchange(BaseExchange):
                     symbols.append(symbol)
             
             logger.info(f"Bitget: Found {len(symbols)} online symbols")
-            return symbols
+            self._symbols_cache = symbols
+            self._symbols_cache_ts = time.monotonic()
+            return list(symbols)
             
         except Exception as e:
             logger.error(f"Failed to get Bitget symbols: {e}")
@@ -480,14 +546,7 @@ class BitgetExchange(BaseExchange):
             return []
     
     def _map_order_status(self, bitget_status: str) -> OrderStatus:
-        status_map = {
-            'new': OrderStatus.NEW,
-            'partial_fill': OrderStatus.PARTIALLY_FILLED,
-            'full_fill': OrderStatus.FILLED,
-            'cancelled': OrderStatus.CANCELED,
-            'rejected': OrderStatus.REJECTED
-        }
-        return status_map.get(bitget_status, OrderStatus.NEW)
+        return _BITGET_STATUS_MAP.get(bitget_status, OrderStatus.NEW)
     
     async def __aenter__(self):
         return self
@@ -1,5 +1,12 @@
+"""Bybit spot exchange: REST over aiohttp, public tickers over websockets.
+
+Pure asyncio I/O; runs on uvloop when run.py / arbot.main installs it at startup
+(see install_uvloop), with no changes needed here.
+"""
 import asyncio
 import json
+import logging
+import re
 import time
 import hmac
 import hashlib
@@ -7,8 +14,38 @@ from typing import Dict, List, Optional
 from urllib.parse import urlencode
 import aiohttp
 import websockets
+from yarl import URL
 from .base import BaseExchange, Ticker, OrderBook, Order, Balance, OrderSide, OrderType, OrderStatus
 
+try:
+    import orjson
+    json_loads = orjson.loads
+
+    def json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode('utf-8')
+except ImportError:  # orjson is an optional speedup, see requirements.txt
+    json_loads = json.loads
+    json_dumps = json.dumps
+
+
+logger = logging.getLogger(__name__)
+
+# Channel name inside subscribe errors, e.g. "Invalid symbol :[tickers.IOTAUSDT]"
+_INVALID_SYMBOL_RE = re.compile(r'\[(.*?)\]')
+
+
+def _subscribe_frame(topics: List[str]) -> str:
+    # Topics are Bybit channel names (alnum and '.'), so plain string assembly is valid JSON
+    return '{"op":"subscribe","args":["' + '","'.join(topics) + '"]}'
+
+
+def _ticker_from_dict(data: Dict) -> Dict:
+    return data
+
+
+def _ticker_from_list(data: List) -> Dict:
+    return data[0] if data else {}
+
 
 class BybitExchange(BaseExchange):
     def __init__(self, api_key: str, api_secret: str, testnet: bool = False):
@@ -19,22 +56,52 @@ class BybitExchange(BaseExchange):
         self.ws_connection: Optional[websockets.WebSocketServerProtocol] = None
         self._ws_task: Optional[asyncio.Task] = None
         self._recv_window = 5000
+        self._recv_window_str = str(self._recv_window)
+        self._hmac_template = hmac.new((api_secret or '').encode('utf-8'), digestmod=hashlib.sha256)
+        # Constant middle of every signed payload: timestamp + api_key + recv_window + params
+        self._key_window_bytes = f"{api_key}{self._recv_window}".encode('utf-8')
         self._server_time_offset = 0
+        self._ts_cache_ms = 0
+        self._ts_cache_str = ""
         self._subscription_count = 0
         self._expected_subscriptions = 0
+        # (serialized frame, symbol count) per batch, reused when reconnecting with the same symbols
+        self._ticker_sub_frames: List[tuple] = []
+        self._ticker_sub_symbols: List[str] = []
+        # Topic prefix ("tickers.BTCUSDT" -> "tickers") -> (parser for its data, batch emitter)
+        self._topic_handlers = {
+            'tickers': (self._handle_ticker_data, self._emit_tickers),
+            'orderbook': (self._handle_orderbook_data, self._emit_orderbooks)
+        }
+        # Ticker payload unwrapper, picked from the first frame's shape (Bybit keeps one shape per topic)
+        self._ticker_unwrap = None
     
     async def _get_session(self) -> aiohttp.ClientSession:
         if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession()
+            # One long-lived pool: keep-alive reuse avoids a TLS handshake per signed call
+            connector = aiohttp.TCPConnector(
+                limit=0,  # No global cap; the per-host limit is what matters for one API host
+                limit_per_host=32,
+                ttl_dns_cache=300,
+                keepalive_timeout=75,
+                enable_cleanup_closed=True
+            )
+            self.session = aiohttp.ClientSession(connector=connector)
         return self.session
     
     def _generate_signature(self, timestamp: str, params: str) -> str:
-        param_str = f"{timestamp}{self.api_key}{self._recv_window}{params}"
-        return hmac.new(
-            self.api_secret.encode('utf-8'),
-            param_str.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
+        # Copying the keyed template skips re-deriving the HMAC inner/outer key pads
+        h = self._hmac_template.copy()
+        h.update(b"".join((timestamp.encode('ascii'), self._key_window_bytes, params.encode('utf-8'))))
+        return h.hexdigest()
+    
+    def _now_ts_str(self) -> str:
+        """Server-adjusted millisecond timestamp as a string, reused within the same millisecond"""
+        ms = time.time_ns() // 1_000_000 + self._server_time_offset
+        if ms != self._ts_cache_ms:
+            self._ts_cache_ms = ms
+            self._ts_cache_str = str(ms)
+        return self._ts_cache_str
     
     async def _sync_server_time(self) -> None:
         """Synchronize with Bybit server time to avoid timestamp errors"""
@@ -42,13 +109,13 @@ class BybitExchange(BaseExchange):
             session = await self._get_session()
             async with session.get(f"{self.base_url}/v5/market/time") as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = await response.json(loads=json_loads)
                     if data.get('retCode') == 0:
                         server_time = int(data['result']['timeSecond']) * 1000
                         local_time = int(time.time() * 1000)
                         self._server_time_offset = server_time - local_time
         except Exception as e:
-            print(f"Failed to sync Bybit server time: {e}")
+            logger.error(f"Failed to sync Bybit server time: {e}")
             self._server_time_offset = 0
 
     async def _make_request(self, method: str, endpoint: str, params: Optional[Dict] = None, 
@@ -61,25 +128,28 @@ class BybitExchange(BaseExchange):
         
         headers = {}
         
+        # Canonical payload built once: these exact bytes are signed, sent, and reused on retry
+        if method == 'GET':
+            param_str = urlencode(params) if params else ""
+            if signed and param_str:
+                # encoded=True keeps yarl from re-quoting the query we signed
+                url = URL(f"{url}?{param_str}", encoded=True)
+        else:
+            param_str = json_dumps(params) if params else ""
+            headers['Content-Type'] = 'application/json'
+        
         if signed:
             # Sync server time on first signed request
             if self._server_time_offset == 0:
                 await self._sync_server_time()
             
-            timestamp = str(int(time.time() * 1000) + self._server_time_offset)
-            if method == 'GET':
-                param_str = urlencode(params) if params else ""
-                signature = self._generate_signature(timestamp, param_str)
-                url += f"?{param_str}" if param_str else ""
-            else:
-                param_str = json.dumps(params) if params else ""
-                signature = self._generate_signature(timestamp, param_str)
-                headers['Content-Type'] = 'application/json'
+            timestamp = self._now_ts_str()
+            signature = self._generate_signature(timestamp, param_str)
             
             headers.update({
                 'X-BAPI-API-KEY': self.api_key,
                 'X-BAPI-TIMESTAMP': timestamp,
-                'X-BAPI-RECV-WINDOW': str(self._recv_window),
+                'X-BAPI-RECV-WINDOW': self._recv_window_str,
                 'X-BAPI-SIGN': signature
             })
         
@@ -90,49 +160,31 @@ class BybitExchange(BaseExchange):
             if not signed:
                 request_params['params'] = params
         else:
-            request_params['json'] = params
+            request_params['data'] = param_str.encode('utf-8')
         
-        try:
-            async with session.request(method, url, headers=headers, **request_params) as response:
-                data = await response.json()
+        async with session.request(method, url, headers=headers, **request_params) as response:
+            data = await response.json(loads=json_loads)
+            
+            # Handle timestamp errors
+            if data.get('retCode') == 10002:  # Invalid timestamp
+                await self._sync_server_time()
+                # Retry with corrected timestamp
+                timestamp = self._now_ts_str()
+                signature = self._generate_signature(timestamp, param_str)
                 
-                # Handle timestamp errors
-                if data.get('retCode') == 10002:  # Invalid timestamp
-                    await self._sync_server_time()
-                    # Retry with corrected timestamp
-                    timestamp = str(int(time.time() * 1000) + self._server_time_offset)
-                    if method == 'GET':
-                        param_str = urlencode(params) if params else ""
-                        signature = self._generate_signature(timestamp, param_str)
-                        url = f"{self.base_url}{endpoint}"
-                        url += f"?{param_str}" if param_str else ""
-                    else:
-                        param_str = json.dumps(params) if params else ""
-                        signature = self._generate_signature(timestamp, param_str)
-                    
-                    headers.update({
-                        'X-BAPI-TIMESTAMP': timestamp,
-                        'X-BAPI-SIGN': signature
-                    })
-                    
-                    # For retry, use same request_params logic
-                    retry_request_params = {}
-                    if method == 'GET':
-                        if not signed:
-                            retry_request_params['params'] = params
-                    else:
-                        retry_request_params['json'] = params
-                    
-                    async with session.request(method, url, headers=headers, **retry_request_params) as retry_response:
-                        retry_data = await retry_response.json()
-                        if retry_data.get('retCode') != 0:
-                            raise Exception(f"Bybit API error: {retry_data}")
-                        return retry_data
-                elif data.get('retCode') != 0:
-                    raise Exception(f"Bybit API error: {data}")
-                return data
-        except Exception as e:
-            raise e
+                headers.update({
+                    'X-BAPI-TIMESTAMP': timestamp,
+                    'X-BAPI-SIGN': signature
+                })
+                
+                async with session.request(method, url, headers=headers, **request_params) as retry_response:
+                    retry_data = await retry_response.json(loads=json_loads)
+                    if retry_data.get('retCode') != 0:
+                        raise Exception(f"Bybit API error: {retry_data}")
+                    return retry_data
+            elif data.get('retCode') != 0:
+                raise Exception(f"Bybit API error: {data}")
+            return data
     
     async def connect_ws(self, symbols: List[str]) -> None:
         self.symbols = symbols
@@ -142,7 +194,7 @@ class BybitExchange(BaseExchange):
         max_symbols_per_connection = 150   # Maximum for single batch subscription
         
         if len(symbols) > max_symbols_per_connection:
-            print(f"⚠️ Bybit 심볼 수 제한: {len(symbols)} → {max_symbols_per_connection}")
+            logger.warning(f"⚠️ Bybit 심볼 수 제한: {len(symbols)} → {max_symbols_per_connection}")
             symbols = symbols[:max_symbols_per_connection]
             self.symbols = symbols
         
@@ -156,64 +208,68 @@ class BybitExchange(BaseExchange):
                 self.ws_url,
                 ping_interval=20,  # 표준화된 ping 간격
                 ping_timeout=10,   # 표준화된 ping 타임아웃
-                close_timeout=10   # 표준화된 종료 타임아웃
+                close_timeout=10,  # 표준화된 종료 타임아웃
+                compression=None,  # 작은 JSON 프레임이라 permessage-deflate 해제
+                max_size=2**20
             )
             self.connected = True
             
             # Subscribe to all tickers in one batch (much more efficient)
-            print(f"🔄 Bybit: Initiating connection and subscription for {len(symbols)} symbols")
+            logger.info(f"🔄 Bybit: Initiating connection and subscription for {len(symbols)} symbols")
             await self._subscribe_tickers_batch(symbols)
             
-            self._ws_task = asyncio.create_task(self._handle_ws_messages())
+            loop = asyncio.get_running_loop()
+            self._start_emit_consumer()
+            self._ws_task = loop.create_task(self._handle_ws_messages())
         except Exception as e:
-            print(f"Failed to connect to Bybit WebSocket: {e}")
+            logger.error(f"Failed to connect to Bybit WebSocket: {e}")
             self.connected = False
     
     async def _subscribe_tickers_batch(self, symbols: List[str]) -> None:
         """Subscribe to multiple tickers in batches (max 10 per batch due to Bybit limits)"""
         # Prevent duplicate subscriptions
         if self._is_subscribing:
-            print("⚠️ Bybit: Already subscribing, skipping duplicate request")
+            logger.warning("⚠️ Bybit: Already subscribing, skipping duplicate request")
             return
         
         self._is_subscribing = True
-        print(f"🔄 Bybit: Starting batch subscription for {len(symbols)} symbols")
+        logger.info(f"🔄 Bybit: Starting batch subscription for {len(symbols)} symbols")
         
         try:
-            # Bybit has args size limit of 10 per subscription request
-            max_batch_size = 10
-            
-            for i in range(0, len(symbols), max_batch_size):
-                batch_symbols = symbols[i:i + max_batch_size]
-                subscribe_msg = {
-                    "op": "subscribe",
-                    "args": [f"tickers.{symbol}" for symbol in batch_symbols]
-                }
-                await self.ws_connection.send(json.dumps(subscribe_msg))
-                print(f"✅ Bybit batch 구독: {len(batch_symbols)}개 심볼 (batch {i//max_batch_size + 1})")
+            for batch_no, (frame, batch_size) in enumerate(self._ticker_sub_frames_for(symbols), 1):
+                await self.ws_connection.send(frame)
+                logger.debug(f"✅ Bybit batch 구독: {batch_size}개 심볼 (batch {batch_no})")
                 
                 # Rate limit: Bybit allows 30 req/sec, so wait ~0.05s between requests
                 await asyncio.sleep(0.1)  # Ensure we don't exceed 20 req/sec (conservative)
         finally:
             self._is_subscribing = False
-            print(f"✅ Bybit: Batch subscription completed for {len(symbols)} symbols")
+            logger.info(f"✅ Bybit: Batch subscription completed for {len(symbols)} symbols")
+    
+    def _ticker_sub_frames_for(self, symbols: List[str]) -> List[tuple]:
+        """Return serialized ticker subscribe frames, rebuilt only when the symbol list changes"""
+        if symbols != self._ticker_sub_symbols:
+            # Bybit has args size limit of 10 per subscription request
+            max_batch_size = 10
+            frames = []
+            for i in range(0, len(symbols), max_batch_size):
+                batch_symbols = symbols[i:i + max_batch_size]
+                frame = _subscribe_frame([f"tickers.{symbol}" for symbol in batch_symbols])
+                frames.append((frame, len(batch_symbols)))
+            self._ticker_sub_frames = frames
+            self._ticker_sub_symbols = list(symbols)
+        return self._ticker_sub_frames
     
+    # Single-topic subscribes; connect and reconnect go through _subscribe_tickers_batch,
+    # which already packs 10 topics per frame, so these send directly rather than via a queue
     async def _subscribe_ticker(self, symbol: str) -> None:
-        """Individual ticker subscription (used for reconnection)"""
-        subscribe_msg = {
-            "op": "subscribe",
-            "args": [f"tickers.{symbol}"]
-        }
-        await self.ws_connection.send(json.dumps(subscribe_msg))
+        """Individual ticker subscription"""
+        await self.ws_connection.send(_subscribe_frame([f"tickers.{symbol}"]))
         # Rate limit: wait between individual subscription requests
         await asyncio.sleep(0.1)
     
     async def _subscribe_orderbook(self, symbol: str) -> None:
-        subscribe_msg = {
-            "op": "subscribe",
-            "args": [f"orderbook.1.{symbol}"]
-        }
-        await self.ws_connection.send(json.dumps(subscribe_msg))
+        await self.ws_connection.send(_subscribe_frame([f"orderbook.1.{symbol}"]))
         # Rate limit: wait between subscription requests
         await asyncio.sleep(0.1)
     
@@ -224,6 +280,7 @@ class BybitExchange(BaseExchange):
                 await self._ws_task
             except asyncio.CancelledError:
                 pass
+        await self._stop_emit_consumer()
         
         if self.ws_connection:
             await self.ws_connection.close()
@@ -242,42 +299,47 @@ class BybitExchange(BaseExchange):
             try:
                 # If this is a reconnection attempt, recreate the WebSocket connection
                 if retry_count > 0:
-                    print(f"🔄 Bybit WebSocket 재연결 시도 {retry_count}/{max_retries}...")
+                    logger.info(f"🔄 Bybit WebSocket 재연결 시도 {retry_count}/{max_retries}...")
                     self.ws_connection = await websockets.connect(
                         self.ws_url,
                         ping_interval=20,  # 표준화된 ping 간격
                         ping_timeout=10,   # 표준화된 ping 타임아웃
-                        close_timeout=10   # 표준화된 종료 타임아웃
+                        close_timeout=10,  # 표준화된 종료 타임아웃
+                        compression=None,  # 작은 JSON 프레임이라 permessage-deflate 해제
+                        max_size=2**20
                     )
                     
                     # Re-subscribe to all symbols using batch subscription
                     self._subscription_count = 0
                     self._is_subscribing = False  # Reset subscribing flag for reconnection
-                    print(f"🔄 Bybit: Re-subscribing to {len(self.symbols)} symbols after reconnection")
+                    logger.info(f"🔄 Bybit: Re-subscribing to {len(self.symbols)} symbols after reconnection")
                     await self._subscribe_tickers_batch(self.symbols)
                     
-                    print(f"✅ Bybit WebSocket 재연결 성공 (시도 {retry_count})")
+                    logger.info(f"✅ Bybit WebSocket 재연결 성공 (시도 {retry_count})")
                 
                 # Reset retry count on successful connection
                 retry_count = 0
                 self.connected = True
                 
                 # Process messages
-                async for message in self.ws_connection:
+                topic_handlers = self._topic_handlers
+                async for message in self._iter_ws_messages():
                     if not self.connected:
                         break
                         
                     try:
-                        data = json.loads(message)
+                        data = json_loads(message)
                         
                         # Handle different message types
                         if 'topic' in data and 'data' in data:
-                            topic = data['topic']
-                            
-                            if topic.startswith('tickers.'):
-                                await self._handle_ticker_data(data['data'])
-                            elif topic.startswith('orderbook.'):
-                                await self._handle_orderbook_data(data['data'])
+                            route = topic_handlers.get(data['topic'].partition('.')[0])
+                            if route:
+                                # Parse here, run callbacks on the emit consumer; frames that pile up
+                                # while callbacks run are emitted together as one batch
+                                parse, emit = route
+                                parsed = parse(data['data'])
+                                if parsed is not None:
+                                    self._queue_emit(emit, [parsed])
                         elif 'success' in data:
                             # Subscription success message - count and show summary
                             if data.get('success') and data.get('ret_msg') == 'subscribe':
@@ -285,66 +347,65 @@ class BybitExchange(BaseExchange):
                                 if self._subscription_count == 1:
                                     # Show connection info on first success
                                     conn_id = data.get('conn_id', 'unknown')
-                                    print(f"✅ Bybit WebSocket 연결 완료 (ID: {conn_id[:8]}...)")
+                                    logger.info(f"✅ Bybit WebSocket 연결 완료 (ID: {conn_id[:8]}...)")
                                 elif self._subscription_count == self._expected_subscriptions:
                                     # Show final summary when all subscriptions are complete
                                     symbol_count = len(self.symbols) if hasattr(self, 'symbols') else 0
-                                    print(f"✅ Bybit 구독 완료: {symbol_count}개 심볼 (총 {self._subscription_count}개 채널)")
+                                    logger.info(f"✅ Bybit 구독 완료: {symbol_count}개 심볼 (총 {self._subscription_count}개 채널)")
                             else:
                                 # Parse subscription error details
                                 ret_msg = data.get('ret_msg', 'unknown')
                                 if 'Invalid symbol' in ret_msg:
                                     # Extract symbol name from error message
-                                    import re
-                                    symbol_match = re.search(r'\[(.*?)\]', ret_msg)
+                                    symbol_match = _INVALID_SYMBOL_RE.search(ret_msg)
                                     if symbol_match:
                                         failed_channel = symbol_match.group(1)
                                         # Extract symbol from channel (e.g., tickers.IOTAUSDT -> IOTAUSDT)
                                         if '.' in failed_channel:
                                             symbol = failed_channel.split('.')[-1]
-                                            print(f"⚠️ Bybit 구독 실패: Invalid symbol [{symbol}]")
+                                            logger.warning(f"⚠️ Bybit 구독 실패: Invalid symbol [{symbol}]")
                                         else:
-                                            print(f"⚠️ Bybit 구독 실패: {ret_msg}")
+                                            logger.warning(f"⚠️ Bybit 구독 실패: {ret_msg}")
                                     else:
-                                        print(f"⚠️ Bybit 구독 실패: {ret_msg}")
+                                        logger.warning(f"⚠️ Bybit 구독 실패: {ret_msg}")
                                 else:
-                                    print(f"⚠️ Bybit 구독: {ret_msg}")
+                                    logger.warning(f"⚠️ Bybit 구독: {ret_msg}")
                         elif 'ret_msg' in data:
                             # Error message
-                            print(f"❌ Bybit 오류: {data.get('ret_msg', 'unknown error')}")
+                            logger.error(f"❌ Bybit 오류: {data.get('ret_msg', 'unknown error')}")
                         else:
                             # Silently ignore other messages
                             pass
                             
                     except json.JSONDecodeError as e:
-                        print(f"Failed to parse Bybit WebSocket message: {e}")
+                        logger.error(f"Failed to parse Bybit WebSocket message: {e}")
                         continue
                     except Exception as e:
-                        print(f"Error handling Bybit WebSocket message: {e}")
+                        logger.error(f"Error handling Bybit WebSocket message: {e}")
                         continue
                         
             except websockets.exceptions.ConnectionClosed as e:
                 if not self.connected:
-                    print("Bybit WebSocket connection closed by user")
+                    logger.info("Bybit WebSocket connection closed by user")
                     break
                 
                 # Check for rate limit related closures
                 if "1011" in str(e) or "keepalive ping timeout" in str(e):
-                    print(f"⚠️ Bybit WebSocket rate limit detected: {e}")
+                    logger.warning(f"⚠️ Bybit WebSocket rate limit detected: {e}")
                     # Add much longer delay for rate limit recovery
-                    print("⏳ Rate limit 복구를 위해 60초 대기...")
+                    logger.info("⏳ Rate limit 복구를 위해 60초 대기...")
                     await asyncio.sleep(60)
                 else:
-                    print(f"⚠️ Bybit WebSocket connection closed: {e}")
+                    logger.warning(f"⚠️ Bybit WebSocket connection closed: {e}")
                 
             except websockets.exceptions.WebSocketException as e:
-                print(f"⚠️ Bybit WebSocket exception: {e}")
+                logger.warning(f"⚠️ Bybit WebSocket exception: {e}")
                 
             except (OSError, ConnectionError, asyncio.TimeoutError) as e:
-                print(f"⚠️ Bybit WebSocket network error: {e}")
+                logger.warning(f"⚠️ Bybit WebSocket network error: {e}")
                 
             except Exception as e:
-                print(f"❌ Bybit WebSocket unexpected error: {e}")
+                logger.error(f"❌ Bybit WebSocket unexpected error: {e}")
             
             # Reconnection logic
             if not self.connected:
@@ -352,22 +413,25 @@ class BybitExchange(BaseExchange):
                 
             retry_count += 1
             if retry_count > max_retries:
-                print(f"❌ Bybit WebSocket failed to reconnect after {max_retries} attempts")
+                logger.error(f"❌ Bybit WebSocket failed to reconnect after {max_retries} attempts")
                 self.connected = False
                 break
             
             # Exponential backoff with rate limit consideration
             delay = min(base_delay * (2 ** (retry_count - 1)), max_delay)
-            print(f"⏳ Bybit WebSocket reconnecting in {delay:.2f} seconds (avoiding rate limits)...")
+            logger.info(f"⏳ Bybit WebSocket reconnecting in {delay:.2f} seconds (avoiding rate limits)...")
             await asyncio.sleep(delay)
         
-        print("Bybit WebSocket connection permanently closed")
+        logger.info("Bybit WebSocket connection permanently closed")
         self.connected = False
     
-    async def _handle_ticker_data(self, data: Dict) -> None:
+    def _handle_ticker_data(self, data: Dict) -> Optional[Ticker]:
         try:
             # Handle both single ticker and list format
-            ticker_data = data if isinstance(data, dict) else data[0] if isinstance(data, list) and data else {}
+            unwrap = self._ticker_unwrap
+            if unwrap is None:
+                unwrap = self._ticker_unwrap = _ticker_from_dict if isinstance(data, dict) else _ticker_from_list
+            ticker_data = unwrap(data)
             
             # Check if minimum required fields exist
             if not ticker_data.get('symbol'):
@@ -382,14 +446,12 @@ class BybitExchange(BaseExchange):
                 bid = float(bid_price)
                 ask = float(ask_price)
             elif last_price:
-                # Use lastPrice as both bid and ask if bid/ask not available
-                last = float(last_price)
-                bid = last * 0.9999  # Slightly lower for bid
-                ask = last * 1.0001  # Slightly higher for ask
+                # Use lastPrice as both bid and ask if bid/ask not available (no synthetic spread)
+                bid = ask = float(last_price)
             else:
                 return  # Skip if no price data available
             
-            ticker = Ticker(
+            return Ticker(
                 symbol=ticker_data['symbol'],
                 bid=bid,
                 ask=ask,
@@ -397,11 +459,11 @@ class BybitExchange(BaseExchange):
                 ask_size=float(ticker_data.get('ask1Size', 0)),
                 timestamp=float(ticker_data.get('ts', time.time() * 1000)) / 1000
             )
-            await self._emit_ticker(ticker)
         except (KeyError, ValueError, TypeError) as e:
-            print(f"Error processing Bybit ticker data: {e}, data: {data}")
+            logger.error(f"Error processing Bybit ticker data: {e}, data: {data}")
+            return None
     
-    async def _handle_orderbook_data(self, data: Dict) -> None:
+    def _handle_orderbook_data(self, data: Dict) -> Optional[OrderBook]:
         try:
             # Handle both direct data and nested data format
             orderbook_data = data if 's' in data else data.get('data', {}) if isinstance(data, dict) else {}
@@ -429,15 +491,16 @@ class BybitExchange(BaseExchange):
                 bids = orderbook_data['bids']
                 asks = orderbook_data['asks']
             
-            orderbook = OrderBook(
+            return OrderBook(
                 symbol=symbol,
-                bids=[(float(bid[0]), float(bid[1])) for bid in bids if len(bid) >= 2],
-                asks=[(float(ask[0]), float(ask[1])) for ask in asks if len(ask) >= 2],
+                # Levels are always [price, size]; unpacking beats indexing plus a len() guard
+                bids=[(float(price), float(size)) for price, size in bids],
+                asks=[(float(price), float(size)) for price, size in asks],
                 timestamp=float(orderbook_data.get('ts', time.time() * 1000)) / 1000
             )
-            await self._emit_orderbook(orderbook)
         except (KeyError, ValueError, TypeError, IndexError) as e:
-            print(f"Error processing Bybit orderbook data: {e}, data: {data}")
+            logger.error(f"Error processing Bybit orderbook data: {e}, data: {data}")
+            return None
     
     async def get_ticker(self, symbol: str) -> Ticker:
         data = await self._make_request('GET', '/v5/market/tickers', {'category': 'spot', 'symbol': symbol})
@@ -457,8 +520,8 @@ class BybitExchange(BaseExchange):
         orderbook_data = data['result']
         return OrderBook(
             symbol=symbol,
-            bids=[(float(bid[0]), float(bid[1])) for bid in orderbook_data['b']],
-            asks=[(float(ask[0]), float(ask[1])) for ask in orderbook_data['a']],
+            bids=[(float(price), float(size)) for price, size in orderbook_data['b']],
+            asks=[(float(price), float(size)) for price, size in orderbook_data['a']],
             timestamp=float(orderbook_data['ts']) / 1000
         )
     
@@ -544,17 +607,17 @@ class BybitExchange(BaseExchange):
             
             # Check if result exists and has data
             if not data or 'result' not in data or not data['result']:
-                print(f"No fee data returned for {symbol}, using default rates")
+                logger.warning(f"No fee data returned for {symbol}, using default rates")
                 return {'maker': 0.001, 'taker': 0.001}  # Default 0.1% fees
             
             result = data['result']
             if 'list' not in result or not result['list']:
-                print(f"No fee list returned for {symbol}, using default rates")
+                logger.warning(f"No fee list returned for {symbol}, using default rates")
                 return {'maker': 0.001, 'taker': 0.001}
             
             fee_data = result['list'][0] if result['list'] else None
             if not fee_data or not isinstance(fee_data, dict):
-                print(f"Invalid fee data structure for {symbol}, using default rates")
+                logger.warning(f"Invalid fee data structure for {symbol}, using default rates")
                 return {'maker': 0.001, 'taker': 0.001}
             
             # Safely extract fee rates with proper validation
@@ -565,7 +628,7 @@ class BybitExchange(BaseExchange):
                 maker_fee = float(maker_rate) if maker_rate is not None else 0.001
                 taker_fee = float(taker_rate) if taker_rate is not None else 0.001
             except (ValueError, TypeError):
-                print(f"Invalid fee rate values for {symbol}, using default rates")
+                logger.warning(f"Invalid fee rate values for {symbol}, using default rates")
                 return {'maker': 0.001, 'taker': 0.001}
             
             return {
@@ -574,7 +637,7 @@ class BybitExchange(BaseExchange):
             }
             
         except Exception as e:
-            print(f"Error getting Bybit trading fees for {symbol}: {e}, using default rates")
+            logger.error(f"Error getting Bybit trading fees for {symbol}: {e}, using default rates")
             return {'maker': 0.001, 'taker': 0.001}  # Default 0.1% fees
     
     async def get_symbols(self) -> List[str]:
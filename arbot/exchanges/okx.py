@@ -11,6 +11,11 @@ import aiohttp
 import websockets
 from .base import BaseExchange, Ticker, OrderBook, Order, Balance, OrderSide, OrderType, OrderStatus
 
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is an optional speedup, see requirements.txt
+    json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
 
@@ -86,7 +91,7 @@ class OKXExchange(BaseExchange):
                 request_params['data'] = body if signed else json.dumps(params)
         
         async with session.request(method, url, headers=headers, **request_params) as response:
-            data = await response.json()
+            data = await response.json(loads=json_loads)
             if data.get('code') != '0':
                 raise Exception(f"OKX API error: {data}")
             return data
@@ -237,10 +242,8 @@ class OKXExchange(BaseExchange):
                 bid = float(bid_price)
                 ask = float(ask_price)
             elif last_price:
-                # Use lastPrice as both bid and ask if bid/ask not available
-                last = float(last_price)
-                bid = last * 0.9999  # Slightly lower for bid
-                ask = last * 1.0001  # Slightly higher for ask
+                # Use lastPrice as both bid and ask if bid/ask not available (no synthetic spread)
+                bid = ask = float(last_price)
             else:
                 return  # Skip if no price data available
             
@@ -1,21 +1,49 @@
+"""Upbit KRW/BTC markets: REST over aiohttp, public tickers over websockets.
+
+Pure asyncio I/O; runs on uvloop when run.py / arbot.main installs it at startup
+(see install_uvloop), with no changes needed here.
+"""
 import asyncio
+import base64
 import json
 import time
 import hmac
 import hashlib
+import itertools
 import uuid
 from typing import Dict, List, Optional
 from urllib.parse import urlencode, parse_qs, urlparse
 import aiohttp
 import websockets
-import jwt
 from .base import BaseExchange, Ticker, OrderBook, Order, Balance, OrderSide, OrderType, OrderStatus
 import logging
 
+try:
+    import orjson
+    json_loads = orjson.loads
+
+    def json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode('utf-8')
+except ImportError:  # orjson is an optional speedup, see requirements.txt
+    json_loads = json.loads
+    json_dumps = json.dumps
+
 logger = logging.getLogger(__name__)
 
 
+def _b64url(data: bytes) -> bytes:
+    """Unpadded base64url, as used by JWT segments"""
+    return base64.urlsafe_b64encode(data).rstrip(b'=')
+
+
+# HS256 JWT header segment; identical for every request
+_JWT_HEADER_B64 = _b64url(b'{"alg":"HS256","typ":"JWT"}')
+
+
 class UpbitExchange(BaseExchange):
+    # Subscribe tickets only label a connection's request; a counter is enough (the JWT nonce keeps uuid4)
+    _ticket_ids = itertools.count(1)
+    
     def __init__(self, api_key: str, api_secret: str, testnet: bool = False):
         super().__init__(api_key, api_secret, testnet)
         self.base_url = "https://api.upbit.com"
@@ -24,12 +52,33 @@ class UpbitExchange(BaseExchange):
         self.ws_connection: Optional[websockets.WebSocketServerProtocol] = None
         self._ws_task: Optional[asyncio.Task] = None
         self.exchange_name = "upbit"
+        self.exchange_name_lc = "upbit"
         self._krw_to_usd_rate = 1.0 / 1300.0  # Default rate, updated dynamically
         self._rate_last_updated = 0
+        # Keyed HMAC state for JWT signatures; copied per token instead of re-keying
+        self._hmac_template = hmac.new((api_secret or '').encode('utf-8'), digestmod=hashlib.sha256)
+        # query_hash per (ordered) flat param set; tokens themselves are never reused (Upbit rejects repeated nonces)
+        self._query_hash_cache: Dict[tuple, str] = {}
+        self._rate_task: Optional[asyncio.Task] = None
+        # Subscribed Upbit code (KRW-BTC) -> standard symbol (BTCUSDT) / whether prices are in KRW
+        self._code_to_symbol: Dict[str, str] = {}
+        self._code_is_krw: Dict[str, bool] = {}
         
     async def _get_session(self) -> aiohttp.ClientSession:
         if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession()
+            # One long-lived pool to api.upbit.com: keep-alive reuse skips DNS + TLS per request
+            connector = aiohttp.TCPConnector(
+                limit=20,
+                limit_per_host=20,
+                ttl_dns_cache=300,
+                keepalive_timeout=60,
+                enable_cleanup_closed=True
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=10, connect=3),
+                json_serialize=json_dumps  # str-returning wrapper, so orjson works for json= bodies
+            )
         return self.session
     
     def _generate_jwt_token(self, query_params: Optional[Dict] = None) -> str:
@@ -40,11 +89,31 @@ class UpbitExchange(BaseExchange):
         }
         
         if query_params:
-            query_string = urlencode(query_params, doseq=True)
-            payload['query_hash'] = hashlib.sha512(query_string.encode()).hexdigest()
+            payload['query_hash'] = self._query_hash(query_params)
             payload['query_hash_alg'] = 'SHA512'
         
-        return jwt.encode(payload, self.api_secret, algorithm='HS256')
+        # HS256 JWT assembled directly (same token PyJWT produces, without its per-call setup)
+        signing_input = _JWT_HEADER_B64 + b'.' + _b64url(json_dumps(payload).encode('utf-8'))
+        h = self._hmac_template.copy()
+        h.update(signing_input)
+        return (signing_input + b'.' + _b64url(h.digest())).decode('ascii')
+    
+    def _query_hash(self, query_params: Dict) -> str:
+        """SHA-512 of the query string, reused for repeated polls with identical params"""
+        if any(isinstance(value, (list, tuple)) for value in query_params.values()):
+            return hashlib.sha512(urlencode(query_params, doseq=True).encode('utf-8')).hexdigest()
+        
+        # Keyed in send order: Upbit hashes the query exactly as sent
+        key = tuple(query_params.items())
+        query_hash = self._query_hash_cache.get(key)
+        if query_hash is None:
+            # Flat params (every current caller): plain join in send order, Upbit's unquoted form
+            query_string = '&'.join(f"{k}={v}" for k, v in key)
+            query_hash = hashlib.sha512(query_string.encode('utf-8')).hexdigest()
+            if len(self._query_hash_cache) >= 256:
+                self._query_hash_cache.clear()
+            self._query_hash_cache[key] = query_hash
+        return query_hash
     
     async def _make_request(self, method: str, endpoint: str, params: Optional[Dict] = None, 
                           signed: bool = False) -> Dict:
@@ -64,15 +133,12 @@ class UpbitExchange(BaseExchange):
             request_params['json'] = params
             headers['Content-Type'] = 'application/json'
         
-        try:
-            async with session.request(method, url, headers=headers, **request_params) as response:
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    error_data = await response.text()
-                    raise Exception(f"Upbit API error ({response.status}): {error_data}")
-        except Exception as e:
-            raise e
+        async with session.request(method, url, headers=headers, **request_params) as response:
+            if response.status == 200:
+                return await response.json(loads=json_loads)
+            else:
+                error_data = await response.text()
+                raise Exception(f"Upbit API error ({response.status}): {error_data}")
     
     async def _get_krw_to_usd_rate(self) -> float:
         """Get current KRW to USD exchange rate with caching"""
@@ -96,6 +162,13 @@ class UpbitExchange(BaseExchange):
         
         return self._krw_to_usd_rate
     
+    async def _refresh_rate_loop(self) -> None:
+        """Refresh the KRW/USD rate in the background so WebSocket handlers just read the attribute"""
+        while True:
+            await asyncio.sleep(600)
+            self._rate_last_updated = 0  # Force the refetch even if the last one landed a moment late
+            await self._get_krw_to_usd_rate()
+    
     async def connect_ws(self, symbols: List[str]) -> None:
         """Connect to Upbit WebSocket and subscribe to ticker data"""
         self.symbols = symbols
@@ -114,7 +187,10 @@ class UpbitExchange(BaseExchange):
                 self.ws_url,
                 ping_interval=20,
                 ping_timeout=10,
-                close_timeout=10
+                close_timeout=10,
+                compression=None,  # 작은 JSON 프레임이라 permessage-deflate 해제
+                max_size=2**20,
+                max_queue=1024  # Room for a burst of frames while the read loop catches up
             )
             self.connected = True
             
@@ -124,6 +200,10 @@ class UpbitExchange(BaseExchange):
             print(f"✅ Upbit 구독 완료: {len(symbols)}개 심볼")
             logger.info(f"✅ Upbit WebSocket connected with {len(symbols)} symbols")
             
+            # Fetch the rate once before ticks arrive, then keep it fresh off the hot path
+            await self._get_krw_to_usd_rate()
+            self._rate_task = asyncio.create_task(self._refresh_rate_loop())
+            self._start_emit_consumer()
             self._ws_task = asyncio.create_task(self._handle_ws_messages())
             
         except Exception as e:
@@ -135,41 +215,54 @@ class UpbitExchange(BaseExchange):
         """Subscribe to ticker data for given symbols"""
         # Convert symbols to Upbit format (e.g., BTCUSDT -> KRW-BTC)
         upbit_symbols = []
+        code_to_symbol = {}
+        code_is_krw = {}
         for symbol in symbols:
             if symbol.endswith('USDT'):
                 # For USDT pairs, use KRW equivalent
                 base = symbol[:-4]  # Remove 'USDT'
-                upbit_symbols.append(f"KRW-{base}")
+                code = f"KRW-{base}"
             elif symbol.endswith('BTC'):
                 # For BTC pairs, use BTC equivalent
                 base = symbol[:-3]  # Remove 'BTC'
-                upbit_symbols.append(f"BTC-{base}")
+                code = f"BTC-{base}"
             else:
                 # Use as is for other formats
-                upbit_symbols.append(symbol)
+                code = symbol
+            upbit_symbols.append(code)
+            # Reverse lookup for the message handlers, built once per subscription
+            code_to_symbol[code] = symbol
+            code_is_krw[code] = code.startswith('KRW-')
+        self._code_to_symbol = code_to_symbol
+        self._code_is_krw = code_is_krw
         
         subscribe_message = [
-            {"ticket": str(uuid.uuid4())},
+            {"ticket": f"arbot-{next(self._ticket_ids)}"},
             {
                 "type": "ticker",
                 "codes": upbit_symbols
-            }
+            },
+            # Abbreviated field names (cd, tp, atv24h, tms, ...) for smaller frames
+            {"format": "SIMPLE"}
         ]
         
-        await self.ws_connection.send(json.dumps(subscribe_message))
+        await self.ws_connection.send(json_dumps(subscribe_message))
         logger.info(f"Upbit WebSocket: Subscribed to {len(upbit_symbols)} symbols")
     
     async def disconnect_ws(self) -> None:
         """Disconnect from WebSocket"""
         self.connected = False
         
-        if self._ws_task:
-            self._ws_task.cancel()
-            try:
-                await self._ws_task
-            except asyncio.CancelledError:
-                pass
-            self._ws_task = None
+        for task in (self._ws_task, self._rate_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._ws_task = None
+        self._rate_task = None
+        await self._stop_emit_consumer()
         
         if self.ws_connection:
             try:
@@ -183,31 +276,32 @@ class UpbitExchange(BaseExchange):
     
     async def _handle_ws_messages(self) -> None:
         """Handle incoming WebSocket messages"""
-        message_count = 0
+        logged_first = False
         
         try:
             async for message in self.ws_connection:
                 if not self.connected:
                     break
                 
-                message_count += 1
-                
-                # Debug first few messages
-                if message_count <= 3:
-                    logger.info(f"📨 Upbit message #{message_count} received")
+                # Confirm the stream is flowing once; no per-message counter after that
+                if not logged_first:
+                    logged_first = True
+                    logger.info("📨 Upbit first message received")
                 
                 try:
-                    # Upbit sends binary data, decode it
-                    if isinstance(message, bytes):
-                        data = json.loads(message.decode('utf-8'))
-                    else:
-                        data = json.loads(message)
+                    # Upbit sends binary frames; both parsers take the bytes as-is
+                    data = json_loads(message)
                     
-                    # Handle ticker data
-                    if data.get('type') == 'ticker':
-                        await self._handle_ticker_data(data)
-                    elif data.get('type') == 'orderbook':
-                        await self._handle_orderbook_data(data)
+                    # Parse here and hand callbacks to the emit consumer so slow callbacks never stall reads
+                    msg_type = data.get('ty')  # SIMPLE format keys, see _subscribe_tickers
+                    if msg_type == 'ticker':
+                        ticker = self._handle_ticker_data(data)
+                        if ticker is not None:
+                            self._queue_emit(self._emit_ticker, ticker)
+                    elif msg_type == 'orderbook':
+                        orderbook = self._handle_orderbook_data(data)
+                        if orderbook is not None:
+                            self._queue_emit(self._emit_orderbook, orderbook)
                     
                 except json.JSONDecodeError as e:
                     logger.warning(f"Upbit WebSocket: Failed to parse message: {e}")
@@ -220,81 +314,57 @@ class UpbitExchange(BaseExchange):
             logger.error(f"Upbit WebSocket connection error: {e}")
             self.connected = False
     
-    async def _handle_ticker_data(self, data: Dict) -> None:
+    def _handle_ticker_data(self, data: Dict) -> Optional[Ticker]:
         """Handle ticker data from WebSocket"""
         try:
             # Map Upbit ticker format to our Ticker format
-            symbol = data['code']
+            code = data['cd']
             
             # Convert KRW-BTC format back to BTCUSDT format for consistency
-            if symbol.startswith('KRW-'):
-                base = symbol[4:]  # Remove 'KRW-'
-                symbol = f"{base}USDT"
-                # Convert KRW price to USD using dynamic rate
-                krw_to_usd = await self._get_krw_to_usd_rate()
-                trade_price = float(data['trade_price']) * krw_to_usd
-            elif symbol.startswith('BTC-'):
-                base = symbol[4:]  # Remove 'BTC-'
-                symbol = f"{base}BTC"
-                trade_price = float(data['trade_price'])
-            else:
-                trade_price = float(data['trade_price'])
+            symbol = self._code_to_symbol[code]
+            # KRW prices convert to USD with the rate kept fresh by _refresh_rate_loop; BTC markets pass through
+            mul = self._krw_to_usd_rate if self._code_is_krw[code] else 1.0
+            trade_price = float(data['tp']) * mul
+            
+            # Upbit has no bid/ask in its ticker; use trade price for both (no synthetic spread)
+            bid = ask = trade_price
             
-            # Create small spread around trade price
-            spread = trade_price * 0.0001  # 0.01% spread
-            bid = trade_price - spread
-            ask = trade_price + spread
+            volume = float(data['atv24h'])  # Use 24h volume as size
             
-            ticker = Ticker(
+            return Ticker(
                 symbol=symbol,
                 bid=bid,
                 ask=ask,
-                bid_size=float(data.get('acc_trade_volume_24h', 0)),  # Use 24h volume as size
-                ask_size=float(data.get('acc_trade_volume_24h', 0)),
-                timestamp=float(data.get('timestamp', time.time() * 1000)) / 1000
+                bid_size=volume,
+                ask_size=volume,
+                timestamp=data['tms'] / 1000  # Always present on Upbit frames (ms)
             )
             
-            await self._emit_ticker(ticker)
-            
         except (KeyError, ValueError, TypeError) as e:
             logger.error(f"Error processing Upbit ticker data: {e}, data: {data}")
+            return None
     
-    async def _handle_orderbook_data(self, data: Dict) -> None:
+    def _handle_orderbook_data(self, data: Dict) -> Optional[OrderBook]:
         """Handle orderbook data from WebSocket"""
         try:
-            symbol = data['code']
-            
             # Convert symbol format
-            if symbol.startswith('KRW-'):
-                base = symbol[4:]
-                symbol = f"{base}USDT"
-            elif symbol.startswith('BTC-'):
-                base = symbol[4:]
-                symbol = f"{base}BTC"
+            symbol = self._code_to_symbol[data['cd']]
             
-            # Parse orderbook data
-            orderbook_units = data.get('orderbook_units', [])
+            # Parse orderbook data; every unit carries both sides, a malformed one lands in the except below
+            orderbook_units = data.get('obu', [])
+            bids = [(float(unit['bp']), float(unit['bs'])) for unit in orderbook_units]
+            asks = [(float(unit['ap']), float(unit['as'])) for unit in orderbook_units]
             
-            bids = []
-            asks = []
-            
-            for unit in orderbook_units:
-                if 'bid_price' in unit and 'bid_size' in unit:
-                    bids.append((float(unit['bid_price']), float(unit['bid_size'])))
-                if 'ask_price' in unit and 'ask_size' in unit:
-                    asks.append((float(unit['ask_price']), float(unit['ask_size'])))
-            
-            orderbook = OrderBook(
+            return OrderBook(
                 symbol=symbol,
                 bids=bids,
                 asks=asks,
-                timestamp=float(data.get('timestamp', time.time() * 1000)) / 1000
+                timestamp=data['tms'] / 1000  # Always present on Upbit frames (ms)
             )
             
-            await self._emit_orderbook(orderbook)
-            
         except (KeyError, ValueError, TypeError) as e:
             logger.error(f"Error processing Upbit orderbook data: {e}, data: {data}")
+            return None
     
     async def get_ticker(self, symbol: str) -> Ticker:
         """Get ticker data via REST API"""
@@ -311,14 +381,14 @@ class UpbitExchange(BaseExchange):
             krw_to_usd = await self._get_krw_to_usd_rate()
             trade_price = trade_price * krw_to_usd
         
-        spread = trade_price * 0.0001
+        volume = float(ticker_data.get('acc_trade_volume_24h', 0))
         
         return Ticker(
             symbol=symbol,
-            bid=trade_price - spread,
-            ask=trade_price + spread,
-            bid_size=float(ticker_data.get('acc_trade_volume_24h', 0)),
-            ask_size=float(ticker_data.get('acc_trade_volume_24h', 0)),
+            bid=trade_price,
+            ask=trade_price,
+            bid_size=volume,
+            ask_size=volume,
             timestamp=time.time()
         )
     
@@ -331,14 +401,9 @@ class UpbitExchange(BaseExchange):
         
         orderbook_units = orderbook_data.get('orderbook_units', [])
         
-        bids = []
-        asks = []
-        
-        for unit in orderbook_units:
-            if 'bid_price' in unit and 'bid_size' in unit:
-                bids.append((float(unit['bid_price']), float(unit['bid_size'])))
-            if 'ask_price' in unit and 'ask_size' in unit:
-                asks.append((float(unit['ask_price']), float(unit['ask_size'])))
+        # Upbit units always carry both sides of a level
+        bids = [(float(unit['bid_price']), float(unit['bid_size'])) for unit in orderbook_units]
+        asks = [(float(unit['ask_price']), float(unit['ask_size'])) for unit in orderbook_units]
         
         return OrderBook(
             symbol=symbol,
@@ -358,6 +423,15 @@ class UpbitExchange(BaseExchange):
         else:
             return symbol
     
+    @staticmethod
+    def _convert_symbol_from_upbit(market: str) -> str:
+        """Convert Upbit market code to standard symbol (KRW-BTC -> BTCUSDT, BTC-XRP -> XRPBTC)"""
+        if market.startswith('KRW-'):
+            return f"{market[4:]}USDT"
+        elif market.startswith('BTC-'):
+            return f"{market[4:]}BTC"
+        return market
+    
     async def place_order(self, symbol: str, side: OrderSide, order_type: OrderType, 
                          quantity: float, price: Optional[float] = None) -> Order:
         """Place an order"""
@@ -452,42 +526,47 @@ class UpbitExchange(BaseExchange):
         """Get all available trading symbols"""
         data = await self._make_request('GET', '/v1/market/all')
         
-        symbols = []
-        for market_data in data:
-            market = market_data['market']
-            # Convert Upbit format to standard format
-            if market.startswith('KRW-'):
-                base = market[4:]
-                symbols.append(f"{base}USDT")
-            elif market.startswith('BTC-'):
-                base = market[4:]
-                symbols.append(f"{base}BTC")
-            else:
-                symbols.append(market)
-        
-        return symbols
+        # Convert Upbit format to standard format
+        return [self._convert_symbol_from_upbit(market_data['market']) for market_data in data]
     
     async def get_all_tickers(self) -> List[Dict]:
-        """Get all ticker data"""
+        """Get all ticker data, keyed and priced like the WebSocket tickers
+        
+        Each dict is {'symbol', 'volume', 'quoteVolume', 'lastPrice'}. KRW-BTC comes back as
+        BTCUSDT and BTC-XRP as XRPBTC; other markets keep their Upbit code. lastPrice and
+        quoteVolume of KRW markets are converted to USD; volume stays in the base asset.
+        Returns [] on failure.
+        """
         try:
             # Get all markets first
             markets_data = await self._make_request('GET', '/v1/market/all')
             markets = [market['market'] for market in markets_data]
             
-            # Get ticker data for all markets
-            tickers_data = await self._make_request('GET', '/v1/ticker', {'markets': ','.join(markets)})
+            # Get ticker data for all markets: 50 per request, at most 5 in flight (REST rate limits)
+            semaphore = asyncio.Semaphore(5)
             
-            # Convert to standard format
-            result = []
-            for ticker in tickers_data:
-                result.append({
-                    'symbol': ticker['market'],
-                    'volume': ticker.get('acc_trade_volume_24h', 0),
-                    'quoteVolume': ticker.get('acc_trade_price_24h', 0),
-                    'lastPrice': ticker.get('trade_price', 0)
-                })
+            async def fetch_chunk(chunk: List[str]) -> List[Dict]:
+                async with semaphore:
+                    return await self._make_request('GET', '/v1/ticker', {'markets': ','.join(chunk)})
+            
+            chunks = [markets[i:i + 50] for i in range(0, len(markets), 50)]
+            results = await asyncio.gather(*[fetch_chunk(chunk) for chunk in chunks])
+            tickers_data = [ticker for result in results for ticker in result]
+            krw_to_usd = await self._get_krw_to_usd_rate()
             
-            return result
+            # Convert to standard format: same symbols and USD prices as the WebSocket tickers
+            convert = self._convert_symbol_from_upbit
+            return [
+                {
+                    'symbol': convert(ticker['market']),
+                    'volume': ticker.get('acc_trade_volume_24h', 0),
+                    'quoteVolume': float(ticker.get('acc_trade_price_24h') or 0) * mul,
+                    'lastPrice': float(ticker.get('trade_price') or 0) * mul
+                }
+                for ticker in tickers_data
+                # Bind the market's price multiplier once per ticker (KRW -> USD, other markets as-is)
+                for mul in (krw_to_usd if ticker['market'].startswith('KRW-') else 1.0,)
+            ]
             
         except Exception as e:
             logger.error(f"Failed to get Upbit tickers: {e}")
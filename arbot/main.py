@@ -6,13 +6,22 @@ Main entry point for the application
 
 import asyncio
 import argparse
+import atexit
+import functools
+import hashlib
 import logging
+import logging.handlers
+import math
+import queue
 import sys
 import os
 from pathlib import Path
-from typing import Dict, Optional, List, Tuple
+from typing import Dict, NamedTuple, Optional, List, Tuple
 from datetime import datetime
 import time
+from collections import deque
+
+import numpy as np
 
 from .config import Config, TradingMode
 from .database import Database
@@ -21,19 +30,240 @@ from .trader import LiveTrader
 from .simulator import TradingSimulator
 from .backtester import Backtester
 from .gui import run_gui
+from .symbol_cache import SymbolCache
 from .exchanges import BinanceExchange, BybitExchange, BitgetExchange, OKXExchange, UpbitExchange
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('arbot.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
+logger = logging.getLogger(__name__)
+
+
+# Checked after the configured quote currencies
+_FALLBACK_QUOTE_PATTERNS = ('USDT', 'BUSD', 'USDC', 'BTC', 'ETH', 'BNB', 'USD', 'EUR')
+
+
+# Symbols known to cause issues on Bybit
+_BYBIT_PROBLEMATIC_SYMBOLS = frozenset({
+    'MLNUSDT', 'DEXEUSDT', 'STORJUSDT', 'KNCUSDT', 'BANDUSDT',
+    'CTKUSDT', 'RSRUSDT', 'RLCUSDT', 'BNTUSDT', 'ALPINEUSDT',
+    'CITYUSDT', 'SANTOSUSDT', 'IBUSDT', 'DREPUSDT', 'WNXMUSDT',
+    'TWTUSDT', 'STRAXUSDT', 'FISUSDT', 'OXTUSDT', 'MDTUSDT'
+})
+
+# Bitget has issues with certain symbol formats
+_BITGET_PROBLEMATIC_SYMBOLS = frozenset({
+    # Symbols with numeric prefixes that don't exist on Bitget
+    '1000CATUSDT', '1000CHEEMSUSDT', '1000SATSUSDT', '1MBABYDOGEUSDT',
+    '1000BONKUSDT', '1000PEPEUSDT', '1000FLOKIUSDT', '1000LUNCUSDT',
+    '1000XECUSDT', '1000RATSUSDT', '1000BTTCUSDT', '1000XUSDT',
+    # Other problematic symbols
+    'STORJUSDT', 'KNCUSDT', 'BANDUSDT', 'CTKUSDT', 'RSRUSDT',
+    'RLCUSDT', 'BNTUSDT', 'DREPUSDT', 'WNXMUSDT', 'TWTUSDT',
+    'STRAXUSDT', 'FISUSDT', 'OXTUSDT', 'MDTUSDT'
+})
+
+# The most common and liquid USDT pairs, used when symbol detection fails
+_FALLBACK_SYMBOLS = (
+    'BTCUSDT', 'ETHUSDT', 'XRPUSDT', 'SOLUSDT', 'ADAUSDT', 'AVAXUSDT',
+    'DOGEUSDT', 'MATICUSDT', 'LINKUSDT', 'LTCUSDT', 'UNIUSDT', 'ATOMUSDT',
+    'DOTUSDT', 'BCHUSDT', 'ETCUSDT', 'FILUSDT', 'TRXUSDT', 'XLMUSDT',
+    'VETUSDT', 'ICPUSDT', 'FTMUSDT', 'THETAUSDT', 'HBARUSDT', 'EOSUSDT'
 )
+_BYBIT_FALLBACK_EXCLUDED = frozenset({
+    'MLNUSDT', 'DEXEUSDT', 'STORJUSDT', 'KNCUSDT', 'BANDUSDT'
+})
+_BITGET_FALLBACK_EXCLUDED = frozenset({
+    'STORJUSDT', 'KNCUSDT', 'BANDUSDT', 'CTKUSDT', 'RSRUSDT',
+    'RLCUSDT', 'BNTUSDT', 'DREPUSDT', 'WNXMUSDT', 'TWTUSDT'
+})
 
-logger = logging.getLogger(__name__)
+
+def _write_stdout(text: str) -> None:
+    """Blocking stdout write for run_in_executor"""
+    sys.stdout.write(text)
+    sys.stdout.flush()
+
+
+def _safe_float(value, default=0.0):
+    """Safely convert value to float"""
+    try:
+        return float(value) if value is not None and value != '' else default
+    except (ValueError, TypeError):
+        return default
+
+
+class _TickerSpec(NamedTuple):
+    """Where each exchange keeps the fields of its REST ticker dict"""
+    symbol: str
+    bid: str
+    ask: str
+    last: Tuple[str, ...]  # first non-zero value wins
+    volume: Tuple[str, ...]
+
+
+# md5 only names cache files; usedforsecurity (3.9+) keeps FIPS builds from refusing it
+_MD5_KWARGS = {'usedforsecurity': False} if sys.version_info >= (3, 9) else {}
+
+# Seconds a streamed quote stays usable; an exchange with none left falls back to REST
+_STREAM_STALE_AFTER = 30.0
+
+# Keyed by lowercased exchange name
+_TICKER_SPECS = {
+    'bybit': _TickerSpec('symbol', 'bid1Price', 'ask1Price', ('lastPrice',), ('volume24h',)),
+    'binance': _TickerSpec('symbol', 'bidPrice', 'askPrice', ('price', 'lastPrice'), ('volume',)),
+    'okx': _TickerSpec('instId', 'bidPx', 'askPx', ('last',), ('vol24h',)),
+    'bitget': _TickerSpec('symbol', 'buyOne', 'sellOne', ('close', 'lastPrice'), ('baseVol',)),
+    # UpbitExchange.get_all_tickers has no bid/ask; its USD lastPrice stands in for both (no synthetic spread)
+    'upbit': _TickerSpec('symbol', 'lastPrice', 'lastPrice', ('lastPrice',), ('volume',)),
+}
+_DEFAULT_TICKER_SPEC = _TickerSpec('symbol', 'bidPrice', 'askPrice', ('lastPrice',), ('volume24h', 'volume'))
+
+
+def _first_float(ticker_data: Dict, keys: Tuple[str, ...]) -> float:
+    """First non-zero float among keys, 0.0 if none"""
+    for key in keys:
+        value = _safe_float(ticker_data.get(key))
+        if value:
+            return value
+    return 0.0
+
+
+@functools.lru_cache(maxsize=None)
+def _ticker_row_parser(spec: _TickerSpec):
+    """Specialize a spec into ticker -> (bid, ask, last, volume) with its keys bound as closure constants"""
+    bid_key, ask_key = spec.bid, spec.ask
+    last_keys, volume_keys = spec.last, spec.volume
+    
+    if bid_key == ask_key and last_keys == (bid_key,):
+        # Bid/ask derived from the last price (Upbit): parse the one field once
+        def parse_price(ticker: Dict) -> Tuple[float, float, float, float]:
+            price = _safe_float(ticker.get(bid_key))
+            return price, price, price, _first_float(ticker, volume_keys)
+        
+        return parse_price
+    
+    def parse(ticker: Dict) -> Tuple[float, float, float, float]:
+        return (
+            _safe_float(ticker.get(bid_key)),
+            _safe_float(ticker.get(ask_key)),
+            _first_float(ticker, last_keys),
+            _first_float(ticker, volume_keys)
+        )
+    
+    return parse
+
+
+def _normalize_ticker(ticker_data: Dict, spec: _TickerSpec, now: float) -> Dict:
+    """Normalize one ticker dict using a precomputed field spec"""
+    bid, ask, last, volume = _ticker_row_parser(spec)(ticker_data)
+    return {
+        'symbol': ticker_data.get(spec.symbol),
+        'bid': bid or None,
+        'ask': ask or None,
+        'last_price': last,
+        'volume': volume,
+        'timestamp': now
+    }
+
+
+class TickerBook:
+    """One exchange's tickers as parallel float64 arrays plus a symbol -> row index
+    
+    Reused across polls: while an exchange keeps returning the same symbols in the
+    same order, update() overwrites the arrays in place. version changes only when
+    the symbol layout does.
+    """
+    
+    __slots__ = ('symbols', 'index', 'bid', 'ask', 'last', 'volume', 'buy', 'sell', 'version', '_parse')
+    
+    def __init__(self, spec: _TickerSpec = _DEFAULT_TICKER_SPEC):
+        self.symbols: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.bid = np.empty(0)  # 0.0 where missing
+        self.ask = np.empty(0)
+        self.last = np.empty(0)
+        self.volume = np.empty(0)
+        self.buy = np.empty(0)  # ask, falling back to last; NaN if unusable
+        self.sell = np.empty(0)  # bid, falling back to last; NaN if unusable
+        self.version = 0
+        self._parse = _ticker_row_parser(spec)
+    
+    def update(self, tickers: List[Dict]) -> None:
+        """Normalize a get_all_tickers() result into the arrays"""
+        parse = self._parse
+        symbols = []
+        rows = []
+        for ticker in tickers:
+            symbol = ticker.get('symbol')
+            if not symbol:
+                continue
+            symbols.append(symbol)
+            rows.append(parse(ticker))
+        
+        self._store(symbols, np.array(rows, dtype=np.float64).reshape(-1, 4))
+    
+    def update_quotes(self, quotes: Dict[str, Tuple[float, float, float]]) -> None:
+        """Load streamed symbol -> (bid, ask, received) quotes; last and volume stay 0.0"""
+        rows = np.zeros((len(quotes), 4))
+        if quotes:
+            rows[:, :2] = np.array(list(quotes.values()))[:, :2]
+        self._store(list(quotes), rows)
+    
+    def _store(self, symbols: List[str], rows: np.ndarray) -> None:
+        """Write (bid, ask, last, volume) rows, reallocating only if the symbols changed"""
+        if symbols != self.symbols:
+            # Layout changed: reallocate and rebuild the index (later duplicates win, as a dict would)
+            self.symbols = symbols
+            self.index = {symbol: row for row, symbol in enumerate(symbols)}
+            count = len(symbols)
+            self.bid, self.ask, self.last, self.volume, self.buy, self.sell = (np.empty(count) for _ in range(6))
+            self.version += 1
+        
+        self.bid[:] = rows[:, 0]
+        self.ask[:] = rows[:, 1]
+        self.last[:] = rows[:, 2]
+        self.volume[:] = rows[:, 3]
+        
+        # calculate_spread uses ask/bid if set, otherwise last price, and skips non-positive prices
+        np.copyto(self.buy, np.where(self.ask != 0, self.ask, self.last))
+        np.copyto(self.sell, np.where(self.bid != 0, self.bid, self.last))
+        self.buy[~(self.buy > 0)] = np.nan
+        self.sell[~(self.sell > 0)] = np.nan
+
+
+def _dense_layout(books: List[TickerBook]) -> Tuple[List[str], List[Tuple[np.ndarray, np.ndarray]]]:
+    """Union of the books' symbols plus, per book, the (column, row) gather that lays it out densely"""
+    columns = {}
+    for book in books:
+        for symbol in book.index:
+            if symbol not in columns:
+                columns[symbol] = len(columns)
+    
+    gathers = []
+    for book in books:
+        count = len(book.index)
+        cols = np.fromiter((columns[symbol] for symbol in book.index), dtype=np.intp, count=count)
+        rows = np.fromiter(book.index.values(), dtype=np.intp, count=count)
+        gathers.append((cols, rows))
+    return list(columns), gathers
+
+
+def _dense_prices(books: List[TickerBook], layout) -> Tuple[np.ndarray, np.ndarray]:
+    """[exchange, symbol] buy/sell matrices from a _dense_layout, NaN where an exchange lacks a symbol"""
+    symbols, gathers = layout
+    buy = np.full((len(books), len(symbols)), np.nan)
+    sell = np.full((len(books), len(symbols)), np.nan)
+    for row, (book, (cols, rows)) in enumerate(zip(books, gathers)):
+        buy[row, cols] = book.buy[rows]
+        sell[row, cols] = book.sell[rows]
+    return buy, sell
+
+
+def _spread_matrix(buy: np.ndarray, sell: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """diff and pct [e1, e2, symbol] for buying on e1 and selling on e2, NaN on the diagonal and gaps"""
+    diff = sell[np.newaxis, :, :] - buy[:, np.newaxis, :]
+    pct = diff / buy[:, np.newaxis, :] * 100
+    diagonal = np.arange(len(buy))
+    pct[diagonal, diagonal] = np.nan
+    return diff, pct
 
 
 class ArBot:
@@ -51,7 +281,22 @@ class ArBot:
         self.spread_monitor_task = None
         self.last_spreads = {}
         self.dynamic_symbols = []
-        self.spread_history = {}  # For premium detection
+        self.symbol_cache = SymbolCache()  # Detected symbols, reused across restarts
+        self.ticker_books: Dict[str, TickerBook] = {}  # Reused across get_all_spreads polls
+        self._dense_layout_cache = None  # (names + book versions, _dense_layout result, symbol quote codes)
+        # exchange -> symbol -> WebSocket (bid, ask, time.monotonic() when received)
+        self.stream_quotes: Dict[str, Dict[str, Tuple[float, float, float]]] = {}
+        self.spread_history: Dict[str, deque] = {}  # For premium detection
+        self.spread_stats: Dict[str, List[float]] = {}  # Running [n, mean, M2] over each history
+        
+        # Quote currency lookups: suffixes sorted once (longest first to avoid conflicts), results memoized per symbol
+        self._sorted_quotes = tuple(sorted(config.arbitrage.available_quote_currencies, key=len, reverse=True))
+        self._enabled_quotes_set = frozenset(config.arbitrage.enabled_quote_currencies)
+        self._quote_cache: Dict[str, str] = {}
+        # Every possible _get_quote_currency result gets a small integer code; the mask says which are enabled
+        quote_names = list(dict.fromkeys(self._sorted_quotes + _FALLBACK_QUOTE_PATTERNS + ("UNKNOWN",)))
+        self._quote_codes = {quote: code for code, quote in enumerate(quote_names)}
+        self._enabled_quote_mask = np.array([quote in self._enabled_quotes_set for quote in quote_names], dtype=bool)
         
         # Validate configuration
         self._validate_config()
@@ -87,15 +332,20 @@ class ArBot:
     
     def _get_quote_currency(self, symbol: str) -> str:
         """Extract quote currency from symbol (e.g., BTCUSDT -> USDT)"""
+        quote = self._quote_cache.get(symbol)
+        if quote is None:
+            quote = self._quote_cache[symbol] = self._match_quote_currency(symbol)
+        return quote
+    
+    def _match_quote_currency(self, symbol: str) -> str:
+        """Uncached suffix match behind _get_quote_currency"""
         # Try common quote currencies in order of priority (longest first to avoid conflicts)
-        sorted_quotes = sorted(self.config.arbitrage.available_quote_currencies, key=len, reverse=True)
-        for quote in sorted_quotes:
+        for quote in self._sorted_quotes:
             if symbol.endswith(quote):
                 return quote
         
         # Additional fallback patterns for edge cases
-        common_patterns = ['USDT', 'BUSD', 'USDC', 'BTC', 'ETH', 'BNB', 'USD', 'EUR']
-        for pattern in common_patterns:
+        for pattern in _FALLBACK_QUOTE_PATTERNS:
             if symbol.endswith(pattern):
                 return pattern
         
@@ -103,82 +353,12 @@ class ArBot:
     
     def _is_symbol_enabled(self, symbol: str) -> bool:
         """Check if symbol's quote currency is enabled"""
-        quote_currency = self._get_quote_currency(symbol)
-        return quote_currency in self.config.arbitrage.enabled_quote_currencies
+        return self._get_quote_currency(symbol) in self._enabled_quotes_set
     
     def normalize_ticker(self, ticker_data: Dict, exchange_name: str) -> Dict:
         """Normalize ticker data from different exchanges"""
-        normalized = {}
-        
-        def safe_float(value, default=0.0):
-            """Safely convert value to float"""
-            try:
-                return float(value) if value is not None and value != '' else default
-            except (ValueError, TypeError):
-                return default
-        
-        if exchange_name.lower() == 'bybit':
-            # Bybit ticker format
-            normalized = {
-                'symbol': ticker_data.get('symbol'),
-                'bid': safe_float(ticker_data.get('bid1Price')) or None,
-                'ask': safe_float(ticker_data.get('ask1Price')) or None,
-                'last_price': safe_float(ticker_data.get('lastPrice')),
-                'volume': safe_float(ticker_data.get('volume24h')),
-                'timestamp': time.time()
-            }
-        elif exchange_name.lower() == 'binance':
-            # Binance ticker format
-            normalized = {
-                'symbol': ticker_data.get('symbol'),
-                'bid': safe_float(ticker_data.get('bidPrice')) or None,
-                'ask': safe_float(ticker_data.get('askPrice')) or None,
-                'last_price': safe_float(ticker_data.get('price')) or safe_float(ticker_data.get('lastPrice')),
-                'volume': safe_float(ticker_data.get('volume')),
-                'timestamp': time.time()
-            }
-        elif exchange_name.lower() == 'okx':
-            # OKX ticker format
-            normalized = {
-                'symbol': ticker_data.get('instId'),  # OKX uses instId
-                'bid': safe_float(ticker_data.get('bidPx')) or None,
-                'ask': safe_float(ticker_data.get('askPx')) or None,
-                'last_price': safe_float(ticker_data.get('last')),
-                'volume': safe_float(ticker_data.get('vol24h')),
-                'timestamp': time.time()
-            }
-        elif exchange_name.lower() == 'bitget':
-            # Bitget ticker format
-            normalized = {
-                'symbol': ticker_data.get('symbol'),
-                'bid': safe_float(ticker_data.get('buyOne')) or None,  # Bitget uses buyOne for bid
-                'ask': safe_float(ticker_data.get('sellOne')) or None,  # Bitget uses sellOne for ask
-                'last_price': safe_float(ticker_data.get('close')) or safe_float(ticker_data.get('lastPrice')),
-                'volume': safe_float(ticker_data.get('baseVol')),  # Bitget uses baseVol
-                'timestamp': time.time()
-            }
-        elif exchange_name.lower() == 'upbit':
-            # Upbit ticker format
-            normalized = {
-                'symbol': ticker_data.get('market'),  # Upbit uses market for symbol
-                'bid': safe_float(ticker_data.get('trade_price')) * 0.9999 if ticker_data.get('trade_price') else None,
-                'ask': safe_float(ticker_data.get('trade_price')) * 1.0001 if ticker_data.get('trade_price') else None,
-                'last_price': safe_float(ticker_data.get('trade_price')),
-                'volume': safe_float(ticker_data.get('acc_trade_volume_24h')),
-                'timestamp': time.time()
-            }
-        else:
-            # Default format - use lastPrice if available
-            normalized = {
-                'symbol': ticker_data.get('symbol'),
-                'bid': safe_float(ticker_data.get('bidPrice')) or None,
-                'ask': safe_float(ticker_data.get('askPrice')) or None,
-                'last_price': safe_float(ticker_data.get('lastPrice')),
-                'volume': safe_float(ticker_data.get('volume24h')) or safe_float(ticker_data.get('volume')),
-                'timestamp': time.time()
-            }
-        
-        return normalized
+        spec = _TICKER_SPECS.get(exchange_name.lower(), _DEFAULT_TICKER_SPEC)
+        return _normalize_ticker(ticker_data, spec, time.time())
     
     def calculate_spread(self, ticker1: Dict, ticker2: Dict, exchange1: str, exchange2: str) -> Dict:
         """Calculate spread between two tickers"""
@@ -206,6 +386,23 @@ class ArBot:
         except (TypeError, ZeroDivisionError, KeyError):
             return None
     
+    def _get_ticker_book(self, exchange_name: str, exchange) -> TickerBook:
+        """The reusable TickerBook for an exchange, created on first use"""
+        book = self.ticker_books.get(exchange_name)
+        if book is None:
+            # Each book carries a parser specialized to its exchange's field spec
+            spec = _TICKER_SPECS.get(exchange.exchange_name_lc, _DEFAULT_TICKER_SPEC)
+            book = self.ticker_books[exchange_name] = TickerBook(spec)
+        return book
+    
+    def _create_stream_callback(self, exchange_name: str):
+        """on_ticker callback that keeps the latest streamed bid/ask for get_all_spreads"""
+        quotes = self.stream_quotes.setdefault(exchange_name, {})
+        
+        async def callback(ticker):
+            quotes[ticker.symbol] = (ticker.bid, ticker.ask, time.monotonic())
+        return callback
+    
     async def get_all_spreads(self) -> List[Dict]:
         """Get all current spreads between arbitrage exchanges"""
         spreads = []
@@ -214,46 +411,83 @@ class ArBot:
         if len(exchange_names) < 2:
             return spreads
         
-        # Get ticker data from all exchanges
         exchange_tickers = {}
+        
+        # Exchanges with a live WebSocket ticker stream are read from memory, no request needed
+        stream_cutoff = time.monotonic() - _STREAM_STALE_AFTER
+        polled = []
         for exchange_name, exchange in self.exchanges.items():
-            try:
-                # Get all tickers for this exchange
-                tickers = await exchange.get_all_tickers()
-                if tickers:
-                    exchange_tickers[exchange_name] = {
-                        ticker['symbol']: self.normalize_ticker(ticker, exchange_name) 
-                        for ticker in tickers if ticker.get('symbol')
-                    }
-            except Exception as e:
-                logger.debug(f"Failed to get tickers from {exchange_name}: {e}")
-                continue
+            quotes = self.stream_quotes.get(exchange_name)
+            if quotes:
+                # A symbol that stopped streaming must not keep its last quote forever
+                for symbol in [symbol for symbol, quote in quotes.items() if quote[2] <= stream_cutoff]:
+                    del quotes[symbol]
+            if quotes:
+                book = self._get_ticker_book(exchange_name, exchange)
+                book.update_quotes(quotes)
+                exchange_tickers[exchange_name] = book
+            else:
+                polled.append((exchange_name, exchange))
         
-        # Calculate spreads for all symbol pairs
-        if len(exchange_tickers) >= 2:
-            for i, exchange1 in enumerate(exchange_names):
-                for j, exchange2 in enumerate(exchange_names):
-                    if i >= j or exchange1 not in exchange_tickers or exchange2 not in exchange_tickers:
-                        continue
-                    
-                    tickers1 = exchange_tickers[exchange1]
-                    tickers2 = exchange_tickers[exchange2]
-                    
-                    # Find common symbols
-                    common_symbols = set(tickers1.keys()) & set(tickers2.keys())
-                    
-                    for symbol in common_symbols:
-                        ticker1 = tickers1[symbol]
-                        ticker2 = tickers2[symbol]
-                        
-                        # Calculate spread in both directions
-                        spread1 = self.calculate_spread(ticker1, ticker2, exchange1, exchange2)
-                        spread2 = self.calculate_spread(ticker2, ticker1, exchange2, exchange1)
-                        
-                        if spread1:
-                            spreads.append(spread1)
-                        if spread2:
-                            spreads.append(spread2)
+        # Poll the rest over REST at once so a poll costs the slowest exchange, not the sum
+        if polled:
+            results = await asyncio.gather(
+                *(exchange.get_all_tickers() for _, exchange in polled),
+                return_exceptions=True
+            )
+            
+            for (exchange_name, exchange), tickers in zip(polled, results):
+                if isinstance(tickers, BaseException):
+                    logger.debug("Failed to get tickers from %s: %s", exchange_name, tickers)
+                    continue
+                try:
+                    if tickers:
+                        book = self._get_ticker_book(exchange_name, exchange)
+                        book.update(tickers)
+                        exchange_tickers[exchange_name] = book
+                except Exception as e:
+                    logger.debug("Failed to get tickers from %s: %s", exchange_name, e)
+                    continue
+        
+        # Calculate spreads for all exchange pairs, both directions, in one pass
+        names = [name for name in exchange_names if name in exchange_tickers]
+        if len(names) >= 2:
+            now = time.time()
+            books = [exchange_tickers[name] for name in names]
+            
+            # The symbol join only changes when some book's symbol layout does
+            layout_key = (tuple(names), tuple(book.version for book in books))
+            if self._dense_layout_cache is None or self._dense_layout_cache[0] != layout_key:
+                layout = _dense_layout(books)
+                quote_codes = np.fromiter(
+                    (self._quote_codes[self._get_quote_currency(symbol)] for symbol in layout[0]),
+                    dtype=np.intp, count=len(layout[0])
+                )
+                self._dense_layout_cache = (layout_key, layout, quote_codes)
+            _, layout, quote_codes = self._dense_layout_cache
+            symbols = layout[0]
+            buy, sell = _dense_prices(books, layout)
+            diff, pct = _spread_matrix(buy, sell)
+            
+            # Only symbols whose quote currency is enabled
+            enabled = self._enabled_quote_mask[quote_codes]
+            hits = np.nonzero(np.isfinite(pct) & enabled)
+            e1s, e2s, cols = hits
+            for e1, e2, col, price1, price2, spread_pct, spread_abs in zip(
+                e1s.tolist(), e2s.tolist(), cols.tolist(),
+                buy[e1s, cols].tolist(), sell[e2s, cols].tolist(),
+                pct[hits].tolist(), diff[hits].tolist()
+            ):
+                spreads.append({
+                    'symbol': symbols[col],
+                    'exchange1': names[e1],
+                    'exchange2': names[e2],
+                    'price1': price1,
+                    'price2': price2,
+                    'spread_pct': spread_pct,
+                    'spread_abs': spread_abs,
+                    'timestamp': now
+                })
         
         return spreads
     
@@ -263,30 +497,28 @@ class ArBot:
             return []
         
         max_threshold = self.config.arbitrage.max_spread_threshold
-        valid_spreads = []
-        
-        for spread in spreads:
-            abs_spread = abs(spread['spread_pct'])
-            if abs_spread <= max_threshold:
-                valid_spreads.append(spread)
-            # Silently filter out anomalous spreads
-        
-        return valid_spreads
+        # Silently filter out anomalous spreads
+        return [spread for spread in spreads if abs(spread['spread_pct']) <= max_threshold]
     
     def get_top_spreads(self, spreads: List[Dict], n: int = 3) -> List[Dict]:
         """Get top N spreads by absolute percentage"""
-        if not spreads:
+        if n <= 0:
             return []
         
         # Filter out anomalous spreads first
-        valid_spreads = self.filter_valid_spreads(spreads)
-        
-        if not valid_spreads:
+        valid = self.filter_valid_spreads(spreads)
+        if not valid:
             return []
         
-        # Sort by absolute spread percentage (descending)
-        sorted_spreads = sorted(valid_spreads, key=lambda x: abs(x['spread_pct']), reverse=True)
-        return sorted_spreads[:n]
+        abs_pct = np.abs(np.fromiter((s['spread_pct'] for s in valid), dtype=np.float64, count=len(valid)))
+        
+        # Select the N largest without sorting everything, then order just those (descending)
+        if len(valid) > n:
+            top = np.argpartition(abs_pct, -n)[-n:]
+            top = top[np.argsort(-abs_pct[top], kind='stable')]
+        else:
+            top = np.argsort(-abs_pct, kind='stable')
+        return [valid[i] for i in top.tolist()]
     
     def update_spread_history(self, spread: Dict):
         """Update spread history for premium detection"""
@@ -295,35 +527,49 @@ class ArBot:
         
         key = f"{spread['exchange1']}_{spread['exchange2']}_{spread['symbol']}"
         
-        if key not in self.spread_history:
-            self.spread_history[key] = []
+        history = self.spread_history.get(key)
+        if history is None:
+            # Keep only recent history; deque evicts the oldest sample on append
+            history = deque(maxlen=self.config.arbitrage.premium_detection.lookback_periods)
+            self.spread_history[key] = history
+            self.spread_stats[key] = [0, 0.0, 0.0]
+        
+        # Welford update: drop the sample the deque is about to evict, then add the new one
+        stats = self.spread_stats[key]
+        n, mean, m2 = stats
+        value = spread['spread_pct']
+        if history and len(history) == history.maxlen:
+            evicted = history[0]
+            if n > 1:
+                new_mean = mean - (evicted - mean) / (n - 1)
+                m2 -= (evicted - mean) * (evicted - new_mean)
+                mean = new_mean
+            else:
+                mean = m2 = 0.0
+            n -= 1
         
-        self.spread_history[key].append(spread['spread_pct'])
+        history.append(value)
         
-        # Keep only recent history
-        max_periods = self.config.arbitrage.premium_detection.lookback_periods
-        if len(self.spread_history[key]) > max_periods:
-            self.spread_history[key] = self.spread_history[key][-max_periods:]
+        n += 1
+        delta = value - mean
+        mean += delta / n
+        m2 += delta * (value - mean)
+        stats[0], stats[1], stats[2] = n, mean, max(m2, 0.0)
     
     def get_adjusted_spread(self, spread: Dict) -> Dict:
-        """Adjust spread based on historical premium"""
+        """Adjust spread based on historical premium (updates and returns the same dict)"""
         if not self.config.arbitrage.premium_detection.enabled:
             return spread
         
         key = f"{spread['exchange1']}_{spread['exchange2']}_{spread['symbol']}"
-        history = self.spread_history.get(key, [])
+        history = self.spread_history.get(key)
         
-        if len(history) < self.config.arbitrage.premium_detection.min_samples:
+        if not history or len(history) < self.config.arbitrage.premium_detection.min_samples:
             return spread
         
-        # Calculate average and standard deviation
-        import statistics
-        avg_spread = statistics.mean(history)
-        
-        try:
-            std_spread = statistics.stdev(history)
-        except statistics.StatisticsError:
-            std_spread = 0
+        # Average and sample standard deviation come from the running stats
+        n, avg_spread, m2 = self.spread_stats[key]
+        std_spread = math.sqrt(m2 / (n - 1)) if n > 1 else 0
         
         # Adjust current spread by removing average premium
         adjusted_spread_pct = spread['spread_pct'] - avg_spread
@@ -335,26 +581,19 @@ class ArBot:
         else:
             is_outlier = False
         
-        adjusted_spread = spread.copy()
-        adjusted_spread['spread_pct'] = adjusted_spread_pct
-        adjusted_spread['avg_premium'] = avg_spread
-        adjusted_spread['z_score'] = abs(adjusted_spread_pct) / std_spread if std_spread > 0 else 0
-        adjusted_spread['is_outlier'] = is_outlier
+        # Adjust in place: spreads are rebuilt every poll and callers only keep the adjusted one
+        spread['spread_pct'] = adjusted_spread_pct
+        spread['avg_premium'] = avg_spread
+        spread['z_score'] = abs(adjusted_spread_pct) / std_spread if std_spread > 0 else 0
+        spread['is_outlier'] = is_outlier
         
-        return adjusted_spread
+        return spread
     
     def format_spread_display(self, spread: Dict) -> str:
         """Format spread for display"""
-        symbol = spread['symbol']
-        pct = spread['spread_pct']
-        sign = "+" if pct >= 0 else ""
-        
         # Show outlier indicator if premium detection is enabled
-        outlier_indicator = ""
-        if spread.get('is_outlier', False):
-            outlier_indicator = " 🚨"
-        
-        return f"{symbol} ({sign}{pct:.2f}%){outlier_indicator}"
+        outlier_indicator = " 🚨" if spread.get('is_outlier', False) else ""
+        return "%s (%+.2f%%)%s" % (spread['symbol'], spread['spread_pct'], outlier_indicator)
     
     async def monitor_spreads(self):
         """Monitor and display top spreads continuously"""
@@ -372,18 +611,21 @@ class ArBot:
                 # Get top spreads based on adjusted values
                 top_spreads = self.get_top_spreads(adjusted_spreads, 3)
                 
+                lines = []
                 if top_spreads:
-                    spread_strs = [self.format_spread_display(s) for s in top_spreads]
-                    print(f"🔝 Top 3 스프레드: {' | '.join(spread_strs)}")
+                    lines.append("🔝 Top 3 스프레드: " + " | ".join(map(self.format_spread_display, top_spreads)))
                     
                     # Show premium info for top spread if detection is enabled
                     if (self.config.arbitrage.premium_detection.enabled and 
                         top_spreads[0].get('avg_premium') is not None):
                         top = top_spreads[0]
-                        print(f"    📊 {top['symbol']} 평균 프리미엄: {top['avg_premium']:.2f}%, "
-                              f"Z-스코어: {top['z_score']:.1f}")
+                        lines.append("    📊 %s 평균 프리미엄: %.2f%%, Z-스코어: %.1f"
+                                     % (top['symbol'], top['avg_premium'], top['z_score']))
                 else:
-                    print("📊 스프레드 데이터를 수집 중...")
+                    lines.append("📊 스프레드 데이터를 수집 중...")
+                
+                # One write per poll, done on a worker thread so a slow console can't stall the event loop
+                await asyncio.get_running_loop().run_in_executor(None, _write_stdout, '\n'.join(lines) + '\n')
                 
                 await asyncio.sleep(2)  # Check every 2 seconds
                 
@@ -499,6 +741,8 @@ class ArBot:
                 
                 # Set exchange name for identification
                 exchange.exchange_name = exchange_name
+                # Interned so per-poll lookups keyed by the lowercased name hit the identity fast path
+                exchange.exchange_name_lc = sys.intern(exchange_name.lower())
                 self.exchanges[exchange_name] = exchange
                 print(f"✅ {exchange_name.upper()} 거래소 연결 완료")
                 
@@ -513,64 +757,65 @@ class ArBot:
     
     def _filter_symbols_for_exchange(self, symbols: List[str], exchange_name: str) -> List[str]:
         """Filter out problematic symbols for specific exchanges"""
-        if exchange_name.lower() == 'bybit':
-            # Symbols known to cause issues on Bybit
-            problematic_symbols = {
-                'MLNUSDT', 'DEXEUSDT', 'STORJUSDT', 'KNCUSDT', 'BANDUSDT', 
-                'CTKUSDT', 'RSRUSDT', 'RLCUSDT', 'BNTUSDT', 'ALPINEUSDT',
-                'CITYUSDT', 'SANTOSUSDT', 'IBUSDT', 'DREPUSDT', 'WNXMUSDT',
-                'TWTUSDT', 'STRAXUSDT', 'FISUSDT', 'OXTUSDT', 'MDTUSDT'
-            }
-            return [s for s in symbols if s not in problematic_symbols]
-        elif exchange_name.lower() == 'bitget':
-            # Bitget has issues with certain symbol formats
-            problematic_symbols = {
-                # Symbols with numeric prefixes that don't exist on Bitget
-                '1000CATUSDT', '1000CHEEMSUSDT', '1000SATSUSDT', '1MBABYDOGEUSDT',
-                '1000BONKUSDT', '1000PEPEUSDT', '1000FLOKIUSDT', '1000LUNCUSDT',
-                '1000XECUSDT', '1000RATSUSDT', '1000BTTCUSDT', '1000XUSDT',
-                # Other problematic symbols
-                'STORJUSDT', 'KNCUSDT', 'BANDUSDT', 'CTKUSDT', 'RSRUSDT',
-                'RLCUSDT', 'BNTUSDT', 'DREPUSDT', 'WNXMUSDT', 'TWTUSDT',
-                'STRAXUSDT', 'FISUSDT', 'OXTUSDT', 'MDTUSDT'
-            }
+        exchange_name = exchange_name.lower()
+        if exchange_name == 'bybit':
+            return [s for s in symbols if s not in _BYBIT_PROBLEMATIC_SYMBOLS]
+        elif exchange_name == 'bitget':
             # Also filter out symbols that start with numbers
-            filtered_symbols = []
-            for symbol in symbols:
-                if symbol not in problematic_symbols and not symbol[0].isdigit():
-                    filtered_symbols.append(symbol)
-            return filtered_symbols
-        elif exchange_name.lower() == 'binance':
-            # Filter symbols that might have low liquidity or trading issues
-            return symbols  # Binance generally has good symbol support
+            return [s for s in symbols if s not in _BITGET_PROBLEMATIC_SYMBOLS and not s[0].isdigit()]
         else:
+            # Binance and the rest generally have good symbol support
             return symbols
     
     def _get_fallback_symbols_for_exchange(self, exchange_name: str) -> List[str]:
         """Get fallback symbols for a specific exchange"""
-        # Use the most common and liquid USDT pairs as fallback
-        common_symbols = [
-            'BTCUSDT', 'ETHUSDT', 'XRPUSDT', 'SOLUSDT', 'ADAUSDT', 'AVAXUSDT',
-            'DOGEUSDT', 'MATICUSDT', 'LINKUSDT', 'LTCUSDT', 'UNIUSDT', 'ATOMUSDT',
-            'DOTUSDT', 'BCHUSDT', 'ETCUSDT', 'FILUSDT', 'TRXUSDT', 'XLMUSDT',
-            'VETUSDT', 'ICPUSDT', 'FTMUSDT', 'THETAUSDT', 'HBARUSDT', 'EOSUSDT'
-        ]
-        
-        if exchange_name.lower() == 'bybit':
-            # Remove symbols known to be problematic on Bybit
-            safe_symbols = [s for s in common_symbols if s not in {
-                'MLNUSDT', 'DEXEUSDT', 'STORJUSDT', 'KNCUSDT', 'BANDUSDT'
-            }]
-            return safe_symbols
-        elif exchange_name.lower() == 'bitget':
-            # Remove symbols known to be problematic on Bitget
-            safe_symbols = [s for s in common_symbols if not s[0].isdigit() and s not in {
-                'STORJUSDT', 'KNCUSDT', 'BANDUSDT', 'CTKUSDT', 'RSRUSDT',
-                'RLCUSDT', 'BNTUSDT', 'DREPUSDT', 'WNXMUSDT', 'TWTUSDT'
-            }]
-            return safe_symbols
+        exchange_name = exchange_name.lower()
+        if exchange_name == 'bybit':
+            return [s for s in _FALLBACK_SYMBOLS if s not in _BYBIT_FALLBACK_EXCLUDED]
+        elif exchange_name == 'bitget':
+            return [s for s in _FALLBACK_SYMBOLS if not s[0].isdigit() and s not in _BITGET_FALLBACK_EXCLUDED]
         else:
-            return common_symbols
+            return list(_FALLBACK_SYMBOLS)
+    
+    async def _fetch_exchange_symbols(self, exchange_name: str, exchange) -> Optional[set]:
+        """Filtered USDT symbols for one exchange, fallback symbols on error, None if it returned nothing"""
+        try:
+            logger.info(f"Getting available symbols from {exchange_name}...")
+            
+            # Use get_symbols method if available, otherwise try get_all_tickers
+            if hasattr(exchange, 'get_symbols'):
+                symbols = await asyncio.wait_for(exchange.get_symbols(), timeout=10.0)
+                if symbols:
+                    # Filter for USDT pairs only
+                    usdt_symbols = [s for s in symbols if s.endswith('USDT')]
+                    # Remove known problematic symbols for specific exchanges
+                    filtered_symbols = self._filter_symbols_for_exchange(usdt_symbols, exchange_name)
+                    logger.info(f"{exchange_name}: Found {len(filtered_symbols)} valid USDT pairs (filtered from {len(usdt_symbols)})")
+                    return set(filtered_symbols)
+                else:
+                    logger.warning(f"{exchange_name}: get_symbols returned empty")
+            else:
+                # Fallback to get_all_tickers
+                tickers = await asyncio.wait_for(exchange.get_all_tickers(), timeout=30.0)
+                if tickers:
+                    symbols = [ticker.get('symbol') for ticker in tickers if ticker.get('symbol')]
+                    # Filter for USDT pairs and remove invalid symbols
+                    usdt_symbols = [s for s in symbols if s.endswith('USDT')]
+                    # Remove known problematic symbols for specific exchanges
+                    filtered_symbols = self._filter_symbols_for_exchange(usdt_symbols, exchange_name)
+                    logger.info(f"{exchange_name}: Found {len(filtered_symbols)} valid USDT pairs (filtered from {len(usdt_symbols)})")
+                    return set(filtered_symbols)
+                else:
+                    logger.warning(f"{exchange_name}: get_all_tickers returned empty")
+        
+        except Exception as e:
+            logger.error(f"Failed to get symbols from {exchange_name}: {e}")
+            # Use fallback symbols for this exchange
+            fallback_symbols = self._get_fallback_symbols_for_exchange(exchange_name)
+            logger.warning(f"{exchange_name}: Using fallback symbols ({len(fallback_symbols)} symbols)")
+            return set(fallback_symbols)
+        
+        return None
     
     async def get_common_symbols_with_volume(self) -> List[str]:
         """Dynamically detect common symbols across exchanges"""
@@ -580,45 +825,16 @@ class ArBot:
         
         logger.info(f"Detecting symbols from {len(self.exchanges)} exchanges: {list(self.exchanges.keys())}")
         
-        # Get available symbols from all exchanges
-        exchange_symbols = {}
-        
-        for exchange_name, exchange in self.exchanges.items():
-            try:
-                logger.info(f"Getting available symbols from {exchange_name}...")
-                
-                # Use get_symbols method if available, otherwise try get_all_tickers
-                if hasattr(exchange, 'get_symbols'):
-                    symbols = await asyncio.wait_for(exchange.get_symbols(), timeout=10.0)
-                    if symbols:
-                        # Filter for USDT pairs only
-                        usdt_symbols = [s for s in symbols if s.endswith('USDT')]
-                        # Remove known problematic symbols for specific exchanges
-                        filtered_symbols = self._filter_symbols_for_exchange(usdt_symbols, exchange_name)
-                        exchange_symbols[exchange_name] = set(filtered_symbols)
-                        logger.info(f"{exchange_name}: Found {len(filtered_symbols)} valid USDT pairs (filtered from {len(usdt_symbols)})")
-                    else:
-                        logger.warning(f"{exchange_name}: get_symbols returned empty")
-                else:
-                    # Fallback to get_all_tickers
-                    tickers = await asyncio.wait_for(exchange.get_all_tickers(), timeout=30.0)
-                    if tickers:
-                        symbols = [ticker.get('symbol') for ticker in tickers if ticker.get('symbol')]
-                        # Filter for USDT pairs and remove invalid symbols
-                        usdt_symbols = [s for s in symbols if s.endswith('USDT')]
-                        # Remove known problematic symbols for specific exchanges
-                        filtered_symbols = self._filter_symbols_for_exchange(usdt_symbols, exchange_name)
-                        exchange_symbols[exchange_name] = set(filtered_symbols)
-                        logger.info(f"{exchange_name}: Found {len(filtered_symbols)} valid USDT pairs (filtered from {len(usdt_symbols)})")
-                    else:
-                        logger.warning(f"{exchange_name}: get_all_tickers returned empty")
-                        
-            except Exception as e:
-                logger.error(f"Failed to get symbols from {exchange_name}: {e}")
-                # Use fallback symbols for this exchange
-                fallback_symbols = self._get_fallback_symbols_for_exchange(exchange_name)
-                exchange_symbols[exchange_name] = set(fallback_symbols)
-                logger.warning(f"{exchange_name}: Using fallback symbols ({len(fallback_symbols)} symbols)")
+        # Get available symbols from all exchanges concurrently
+        results = await asyncio.gather(*(
+            self._fetch_exchange_symbols(exchange_name, exchange)
+            for exchange_name, exchange in self.exchanges.items()
+        ))
+        exchange_symbols = {
+            exchange_name: symbols
+            for exchange_name, symbols in zip(self.exchanges.keys(), results)
+            if symbols is not None
+        }
         
         if not exchange_symbols:
             logger.error("Failed to get symbols from any exchange")
@@ -687,14 +903,29 @@ class ArBot:
             
             return final_symbols
     
+    def _symbol_cache_key(self) -> str:
+        """Cache key covering every setting that changes the detected symbol list"""
+        max_symbols = getattr(self.config.arbitrage, 'max_symbols', 200)
+        quotes = ','.join(sorted(self.config.arbitrage.enabled_quote_currencies))
+        exchanges = ','.join(sorted(self.exchanges.keys()))
+        return hashlib.md5(f"{exchanges}|{max_symbols}|{quotes}".encode(), **_MD5_KWARGS).hexdigest()
+    
     async def start(self):
         """Start the trading bot"""
         try:
             print("🚀 ArBot 거래 시작...")
             
             # Always use dynamic symbols detection - this is now the primary method
-            print("🔍 거래소별 지원 심볼 자동 감지 중...")
-            self.dynamic_symbols = await self.get_common_symbols_with_volume()
+            # A recent result for the same detection settings is reused from disk to skip the REST fan-out
+            cache_key = self._symbol_cache_key()
+            self.dynamic_symbols = self.symbol_cache.get(
+                cache_key, ttl_sec=self.config.arbitrage.symbol_cache_ttl_seconds
+            )
+            if not self.dynamic_symbols:
+                print("🔍 거래소별 지원 심볼 자동 감지 중...")
+                self.dynamic_symbols = await self.get_common_symbols_with_volume()
+                if self.dynamic_symbols:
+                    self.symbol_cache.set(cache_key, self.dynamic_symbols)
             
             if not self.dynamic_symbols:
                 raise ValueError("동적 심볼 감지 실패: 사용 가능한 심볼이 없습니다")
@@ -719,18 +950,23 @@ class ArBot:
             symbols_to_monitor = self.dynamic_symbols[:max_symbols]  # Limit to configured max for comprehensive monitoring
             print(f"📡 모니터링 심볼: {len(symbols_to_monitor)}개")
             
-            for i, (exchange_name, exchange) in enumerate(self.exchanges.items()):
+            # Streamed tickers feed the spread monitor so it doesn't have to poll REST
+            for exchange_name, exchange in self.exchanges.items():
+                exchange.on_ticker(self._create_stream_callback(exchange_name))
+            
+            # Each exchange is a different host, so connect them all at once; one failure doesn't stop the rest
+            async def connect_one(exchange_name, exchange):
                 try:
-                    # Add delay between exchange connections to reduce system load
-                    if i > 0:
-                        print(f"⏳ {exchange_name.upper()} 연결 대기 중 (3초)...")
-                        await asyncio.sleep(3)
-                    
                     await exchange.connect_ws(symbols_to_monitor)
                     print(f"✅ {exchange_name.upper()} WebSocket 연결 완료")
                 except Exception as e:
                     logger.error(f"❌ {exchange_name} WebSocket 연결 실패: {e}")
             
+            await asyncio.gather(*(
+                connect_one(exchange_name, exchange)
+                for exchange_name, exchange in self.exchanges.items()
+            ))
+            
             self.is_running = True
             print("🎉 ArBot 거래 시작 완료!")
             print("💡 차익거래 기회를 실시간으로 모니터링합니다...")
@@ -872,7 +1108,8 @@ def create_sample_config():
             "max_position_size": 1000.0,
             "trade_amount_usd": 100.0,
             "slippage_tolerance": 0.001,
-            "max_spread_age_seconds": 5.0
+            "max_spread_age_seconds": 5.0,
+            "symbol_cache_ttl_seconds": 3600.0
         },
         "risk_management": {
             "max_drawdown_percent": 5.0,
@@ -933,6 +1170,41 @@ def print_welcome_message():
     print()
 
 
+def install_uvloop() -> bool:
+    """Switch asyncio to uvloop's libuv event loop when it is installed (optional speedup)"""
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
+def setup_logging() -> None:
+    """Route logging through a QueueListener thread; logging from the event loop is just a queue put"""
+    root = logging.getLogger()
+    if any(isinstance(h, logging.handlers.QueueHandler) for h in root.handlers):
+        return
+    
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    handlers = [
+        logging.FileHandler('arbot.log'),
+        logging.StreamHandler(sys.stdout)
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))  # Listener handlers add the full format
+    logging.basicConfig(
+        level=logging.INFO,
+        handlers=[queue_handler]
+    )
+    listener = logging.handlers.QueueListener(log_queue, *handlers)
+    listener.start()
+    atexit.register(listener.stop)
+
+
 async def main():
     """Main entry point"""
     # 환영 메시지 출력
@@ -953,6 +1225,8 @@ async def main():
     
     args = parser.parse_args()
     
+    # Configure logging
+    setup_logging()
     # Set log level
     logging.getLogger().setLevel(getattr(logging, args.log_level))
     
@@ -1018,6 +1292,7 @@ async def main():
 
 
 if __name__ == "__main__":
+    install_uvloop()
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
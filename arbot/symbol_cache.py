@@ -0,0 +1,56 @@
+"""
+Symbol cache - Persists detected symbol lists to disk so restarts skip the REST fan-out
+"""
+
+import json
+import logging
+import time
+from pathlib import Path
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SymbolCache:
+    """JSON files under a cache directory, one per key, stored as {"ts": ..., "symbols": [...]}"""
+    
+    def __init__(self, cache_dir: str = ".cache"):
+        self.cache_dir = Path(cache_dir)
+    
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"common_symbols_{key}.json"
+    
+    def get(self, key: str, ttl_sec: float = 3600) -> Optional[List[str]]:
+        """Cached symbols for key, or None if missing, unreadable or older than ttl_sec"""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            age = time.time() - data['ts']
+            symbols = data['symbols']
+        except FileNotFoundError:
+            logger.info(f"Symbol cache miss: {key}")
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Symbol cache unreadable ({path}): {e}")
+            return None
+        
+        if age > ttl_sec:
+            logger.info(f"Symbol cache expired: {key} ({age:.0f}s old)")
+            return None
+        
+        logger.info(f"Symbol cache hit: {key} ({len(symbols)} symbols, {age:.0f}s old)")
+        return symbols
+    
+    def set(self, key: str, symbols: List[str]) -> None:
+        """Store symbols for key; failures are logged, never raised"""
+        path = self._path(key)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Write then rename so a crash mid-write never leaves a truncated cache file
+            tmp_path = path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'ts': time.time(), 'symbols': list(symbols)}, f)
+            tmp_path.replace(path)
+        except OSError as e:
+            logger.warning(f"Failed to write symbol cache ({path}): {e}")
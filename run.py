@@ -6,5 +6,6 @@ ArBot - Entry point script for running from project root
 import asyncio
 
 if __name__ == "__main__":
-    from arbot.main import main
+    from arbot.main import main, install_uvloop
+    install_uvloop()
     asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Test the TickerBook / spread matrix path of get_all_spreads against pairwise calculate_spread"""
+
+import asyncio
+import math
+import sys
+
+import arbot.main  # noqa: F401 - arbot re-exports main(), which shadows the module attribute
+from arbot.config import Config
+
+main_module = sys.modules['arbot.main']
+
+
+class FakeExchange:
+    def __init__(self, name, tickers):
+        self.exchange_name_lc = name
+        self.tickers = tickers
+
+    async def get_all_tickers(self):
+        return self.tickers
+
+
+# Fixed tickers in each exchange's REST format: symbols missing on some exchanges,
+# zero / empty / None prices, and bid/ask missing so last price is used instead
+TICKERS = {
+    'bybit': [
+        {'symbol': 'BTCUSDT', 'bid1Price': '100.0', 'ask1Price': '100.5', 'lastPrice': '100.2', 'volume24h': '10'},
+        {'symbol': 'ETHUSDT', 'bid1Price': '', 'ask1Price': '', 'lastPrice': '20.0', 'volume24h': '5'},
+        {'symbol': 'XRPUSDT', 'bid1Price': '0', 'ask1Price': '0', 'lastPrice': '0', 'volume24h': '1'},
+        {'symbol': 'SOLUSDT', 'bid1Price': '9.9', 'ask1Price': None, 'lastPrice': '10.0', 'volume24h': '3'},
+        {'symbol': 'BYBITONLYUSDT', 'bid1Price': '1.0', 'ask1Price': '1.1', 'lastPrice': '1.05'},
+    ],
+    'binance': [
+        {'symbol': 'BTCUSDT', 'bidPrice': '101.0', 'askPrice': '101.2', 'lastPrice': '101.1', 'volume': '7'},
+        {'symbol': 'ETHUSDT', 'bidPrice': '19.5', 'askPrice': '19.6', 'lastPrice': '19.55'},
+        {'symbol': 'XRPUSDT', 'bidPrice': '0.5', 'askPrice': '0.51', 'lastPrice': '0.505'},
+        {'symbol': 'SOLUSDT', 'bidPrice': '0', 'askPrice': '10.2', 'lastPrice': '0'},
+        {'symbol': 'ADAUSDT', 'bidPrice': '0.3', 'askPrice': '0.31', 'lastPrice': '0.305'},
+    ],
+    'bitget': [
+        {'symbol': 'BTCUSDT', 'buyOne': '99.0', 'sellOne': '99.5', 'close': '99.2', 'baseVol': '3'},
+        {'symbol': 'ETHUSDT', 'buyOne': None, 'sellOne': '20.5', 'close': '20.2'},
+        {'symbol': 'ADAUSDT', 'buyOne': '0.29', 'sellOne': '', 'close': '0', 'lastPrice': '0.3'},
+        {'symbol': 'SOLUSDT', 'buyOne': '', 'sellOne': '', 'close': '', 'lastPrice': ''},
+        {'symbol': '', 'buyOne': '1', 'sellOne': '1', 'close': '1'},
+    ],
+}
+
+
+def _make_bot(monkeypatch, exchanges):
+    monkeypatch.setattr(main_module.ArBot, '_validate_config', lambda self: None)
+    config = Config()
+    config.arbitrage.available_quote_currencies = ['USDT', 'BTC']
+    config.arbitrage.enabled_quote_currencies = ['USDT']
+    monkeypatch.setattr(config, 'get_arbitrage_exchanges', lambda: list(exchanges))
+
+    bot = main_module.ArBot(config)
+    bot.exchanges = exchanges
+    return bot
+
+
+def _pairwise_spreads(bot, exchanges):
+    """Reference: normalize every ticker, then calculate_spread over each common symbol in both directions"""
+    normalized = {
+        name: {
+            ticker['symbol']: bot.normalize_ticker(ticker, name)
+            for ticker in exchange.tickers if ticker.get('symbol')
+        }
+        for name, exchange in exchanges.items()
+    }
+
+    spreads = []
+    names = list(exchanges)
+    for i, exchange1 in enumerate(names):
+        for exchange2 in names[i + 1:]:
+            tickers1 = normalized[exchange1]
+            tickers2 = normalized[exchange2]
+            for symbol in set(tickers1) & set(tickers2):
+                for spread in (
+                    bot.calculate_spread(tickers1[symbol], tickers2[symbol], exchange1, exchange2),
+                    bot.calculate_spread(tickers2[symbol], tickers1[symbol], exchange2, exchange1)
+                ):
+                    if spread:
+                        spreads.append(spread)
+    return spreads
+
+
+def _by_key(spreads):
+    return {(s['symbol'], s['exchange1'], s['exchange2']): s for s in spreads}
+
+
+def test_spread_matrix_matches_pairwise_calculate_spread(monkeypatch):
+    exchanges = {name: FakeExchange(name, tickers) for name, tickers in TICKERS.items()}
+    bot = _make_bot(monkeypatch, exchanges)
+
+    expected = _by_key(_pairwise_spreads(bot, exchanges))
+    actual = _by_key(asyncio.run(bot.get_all_spreads()))
+
+    assert expected
+    assert set(actual) == set(expected)
+    for key, spread in expected.items():
+        for field in ('price1', 'price2', 'spread_pct', 'spread_abs'):
+            assert math.isclose(actual[key][field], spread[field], rel_tol=1e-12), (key, field)
+
+    # Both directions, ask-or-last on the buy side and bid-or-last on the sell side
+    assert actual[('BTCUSDT', 'bybit', 'binance')]['price1'] == 100.5
+    assert actual[('BTCUSDT', 'bybit', 'binance')]['price2'] == 101.0
+    assert actual[('BTCUSDT', 'binance', 'bybit')]['price1'] == 101.2
+    assert actual[('BTCUSDT', 'binance', 'bybit')]['price2'] == 100.0
+    assert actual[('ETHUSDT', 'bybit', 'bitget')]['price1'] == 20.0
+    assert actual[('ETHUSDT', 'bitget', 'bybit')]['price2'] == 20.0
+    assert actual[('ETHUSDT', 'bybit', 'bitget')]['price2'] == 20.2
+    # Zero prices never produce a spread, and symbols listed on one exchange only never pair
+    assert not any(key[0] == 'XRPUSDT' for key in actual)
+    assert ('SOLUSDT', 'binance', 'bybit') in actual
+    assert ('SOLUSDT', 'bybit', 'binance') not in actual
+    assert not any(key[0] == 'SOLUSDT' and 'bitget' in key for key in actual)
+    assert not any(key[0] in ('BYBITONLYUSDT', '') for key in actual)
+
+
+def test_spread_matrix_matches_after_book_reuse(monkeypatch):
+    exchanges = {name: FakeExchange(name, tickers) for name, tickers in TICKERS.items()}
+    bot = _make_bot(monkeypatch, exchanges)
+    asyncio.run(bot.get_all_spreads())
+
+    # Same symbol layout with new prices (arrays overwritten in place), then a changed layout
+    exchanges['binance'].tickers = [dict(t, bidPrice='102.0') if t['symbol'] == 'BTCUSDT' else t
+                                    for t in TICKERS['binance']]
+    exchanges['bitget'].tickers = TICKERS['bitget'][:2]
+    for _ in range(2):
+        expected = _by_key(_pairwise_spreads(bot, exchanges))
+        actual = _by_key(asyncio.run(bot.get_all_spreads()))
+        assert set(actual) == set(expected)
+        for key, spread in expected.items():
+            assert math.isclose(actual[key]['spread_pct'], spread['spread_pct'], rel_tol=1e-12), key
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""Test the running (Welford) spread statistics used for premium detection"""
+
+import math
+import random
+import statistics
+import sys
+
+import arbot.main  # noqa: F401 - arbot re-exports main(), which shadows the module attribute
+from arbot.config import Config
+
+main_module = sys.modules['arbot.main']
+
+
+def _make_bot(monkeypatch, lookback_periods, min_samples):
+    monkeypatch.setattr(main_module.ArBot, '_validate_config', lambda self: None)
+    config = Config()
+    config.arbitrage.premium_detection.enabled = True
+    config.arbitrage.premium_detection.lookback_periods = lookback_periods
+    config.arbitrage.premium_detection.min_samples = min_samples
+    return main_module.ArBot(config)
+
+
+def _spread(spread_pct):
+    return {'symbol': 'BTCUSDT', 'exchange1': 'binance', 'exchange2': 'bybit', 'spread_pct': spread_pct}
+
+
+def test_running_stats_match_history_after_eviction(monkeypatch):
+    bot = _make_bot(monkeypatch, lookback_periods=20, min_samples=5)
+    key = 'binance_bybit_BTCUSDT'
+    rng = random.Random(7)
+
+    for i in range(137):
+        bot.update_spread_history(_spread(rng.uniform(-2.0, 2.0) + (5.0 if i % 31 == 0 else 0.0)))
+        history = bot.spread_history[key]
+        n, mean, m2 = bot.spread_stats[key]
+
+        assert n == len(history) == min(i + 1, 20)
+        assert math.isclose(mean, statistics.mean(history), rel_tol=1e-9, abs_tol=1e-12)
+        assert math.isclose(m2 / n, statistics.pvariance(history), rel_tol=1e-9, abs_tol=1e-12)
+
+
+def test_adjusted_spread_uses_history_mean_and_stdev(monkeypatch):
+    bot = _make_bot(monkeypatch, lookback_periods=10, min_samples=5)
+    rng = random.Random(11)
+    for _ in range(45):
+        bot.update_spread_history(_spread(rng.uniform(0.0, 1.0)))
+    history = list(bot.spread_history['binance_bybit_BTCUSDT'])
+
+    adjusted = bot.get_adjusted_spread(_spread(3.0))
+
+    assert math.isclose(adjusted['avg_premium'], statistics.mean(history), rel_tol=1e-9)
+    assert math.isclose(adjusted['spread_pct'], 3.0 - statistics.mean(history), rel_tol=1e-9)
+    assert math.isclose(adjusted['z_score'], adjusted['spread_pct'] / statistics.stdev(history), rel_tol=1e-9)
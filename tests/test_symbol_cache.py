@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""Test the on-disk common-symbol cache"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import arbot.main  # noqa: F401 - arbot re-exports main(), which shadows the module attribute
+from arbot import symbol_cache as symbol_cache_module
+from arbot.config import Config, TradingMode
+from arbot.symbol_cache import SymbolCache
+
+main_module = sys.modules['arbot.main']
+
+
+def test_round_trip(tmp_path):
+    cache = SymbolCache(str(tmp_path / 'cache'))
+    cache.set('k', ['BTCUSDT', 'ETHUSDT'])
+
+    assert cache.get('k') == ['BTCUSDT', 'ETHUSDT']
+    assert cache.get('other') is None
+
+
+def test_ttl_expiry(tmp_path, monkeypatch):
+    cache = SymbolCache(str(tmp_path))
+    now = 1_700_000_000.0
+    monkeypatch.setattr(symbol_cache_module.time, 'time', lambda: now)
+    cache.set('k', ['BTCUSDT'])
+
+    now += 3599
+    assert cache.get('k', ttl_sec=3600) == ['BTCUSDT']
+    now += 2
+    assert cache.get('k', ttl_sec=3600) is None
+    assert cache.get('k', ttl_sec=7200) == ['BTCUSDT']
+
+
+def test_missing_or_corrupt_file(tmp_path):
+    cache = SymbolCache(str(tmp_path / 'never_created'))
+    assert cache.get('k') is None
+
+    cache = SymbolCache(str(tmp_path))
+    path = tmp_path / 'common_symbols_k.json'
+    for content in ('{"ts": 1700000', 'not json', '[]', '{"symbols": ["BTCUSDT"]}', '{"ts": "x", "symbols": []}'):
+        path.write_text(content, encoding='utf-8')
+        assert cache.get('k') is None, content
+
+
+def test_set_replaces_atomically(tmp_path, monkeypatch):
+    cache = SymbolCache(str(tmp_path))
+    cache.set('k', ['BTCUSDT'])
+    cache.set('k', ['ETHUSDT', 'XRPUSDT'])
+    assert cache.get('k') == ['ETHUSDT', 'XRPUSDT']
+    assert [p.name for p in tmp_path.iterdir()] == ['common_symbols_k.json']
+
+    # A write that fails before the rename leaves the previous file untouched
+    def failing_replace(self, target):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(Path, 'replace', failing_replace)
+    cache.set('k', ['SOLUSDT'])
+    assert cache.get('k') == ['ETHUSDT', 'XRPUSDT']
+    data = json.loads((tmp_path / 'common_symbols_k.json').read_text(encoding='utf-8'))
+    assert data['symbols'] == ['ETHUSDT', 'XRPUSDT']
+
+
+def test_cache_key_and_ttl_follow_config(monkeypatch):
+    monkeypatch.setattr(main_module.ArBot, '_validate_config', lambda self: None)
+    config = Config()
+    assert config.arbitrage.symbol_cache_ttl_seconds == 3600.0
+
+    config.arbitrage.enabled_quote_currencies = ['USDT']
+    bot = main_module.ArBot(config)
+    bot.exchanges = {'bybit': None, 'binance': None}
+    key = bot._symbol_cache_key()
+
+    bot.exchanges = {'binance': None, 'bybit': None}
+    assert bot._symbol_cache_key() == key
+
+    config.arbitrage.enabled_quote_currencies = ['USDT', 'BTC']
+    assert bot._symbol_cache_key() != key
+    config.arbitrage.enabled_quote_currencies = ['USDT']
+    config.arbitrage.max_symbols = 50
+    assert bot._symbol_cache_key() != key
+
+
+class StubExchange:
+    def __init__(self, symbols):
+        self.symbols = symbols
+        self.get_symbols_calls = 0
+        self.connected_with = None
+        self.ticker_callbacks = []
+
+    async def get_symbols(self):
+        self.get_symbols_calls += 1
+        return self.symbols
+
+    def on_ticker(self, callback):
+        self.ticker_callbacks.append(callback)
+
+    async def connect_ws(self, symbols):
+        self.connected_with = list(symbols)
+
+
+class StubComponent:
+    """Stands in for the strategy and simulator, which start() only sets up and starts"""
+
+    def __init__(self):
+        self.active_symbols = None
+        self.started = False
+
+    def set_active_symbols(self, symbols):
+        self.active_symbols = list(symbols)
+
+    async def start(self):
+        self.started = True
+
+
+def _start_bot(config, exchanges, cache_dir):
+    bot = main_module.ArBot(config)
+    bot.exchanges = exchanges
+    bot.symbol_cache = SymbolCache(str(cache_dir))
+    bot.strategy = StubComponent()
+    bot.simulator = StubComponent()
+
+    async def run():
+        await bot.start()
+        bot.spread_monitor_task.cancel()
+        try:
+            await bot.spread_monitor_task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(run())
+    return bot
+
+
+def test_start_detects_then_reuses_cached_symbols(tmp_path, monkeypatch):
+    monkeypatch.setattr(main_module.ArBot, '_validate_config', lambda self: None)
+    config = Config()
+    config.trading_mode = TradingMode.SIMULATION
+    config.arbitrage.max_symbols = 3
+    config.arbitrage.enabled_quote_currencies = ['USDT']
+    symbols = ['ADAUSDT', 'BTCUSDT', 'ETHUSDT', 'SOLUSDT', 'XRPUSDT']
+
+    exchanges = {'binance': StubExchange(symbols), 'okx': StubExchange(symbols + ['DOGEUSDT'])}
+    bot = _start_bot(config, exchanges, tmp_path)
+
+    assert bot.is_running
+    assert bot.strategy.active_symbols == bot.dynamic_symbols
+    assert bot.strategy.started and bot.simulator.started
+    for exchange in exchanges.values():
+        assert exchange.get_symbols_calls == 1
+        assert exchange.connected_with == bot.dynamic_symbols[:3]
+        assert len(exchange.ticker_callbacks) == 1
+
+    # A second start with the same settings reads the cache instead of asking the exchanges
+    exchanges = {'binance': StubExchange(symbols), 'okx': StubExchange(symbols + ['DOGEUSDT'])}
+    cached = _start_bot(config, exchanges, tmp_path)
+
+    assert cached.dynamic_symbols == bot.dynamic_symbols
+    for exchange in exchanges.values():
+        assert exchange.get_symbols_calls == 0
+        assert exchange.connected_with == bot.dynamic_symbols[:3]
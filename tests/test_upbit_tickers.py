@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Test the shape of UpbitExchange.get_all_tickers, which symbol detection and the GUI rely on"""
+
+import asyncio
+import math
+import sys
+
+import arbot.main  # noqa: F401 - arbot re-exports main(), which shadows the module attribute
+from arbot.exchanges.upbit import UpbitExchange
+
+main_module = sys.modules['arbot.main']
+
+KRW_PER_USDT = 1400.0
+MARKETS = [{'market': 'KRW-BTC'}, {'market': 'BTC-XRP'}, {'market': 'USDT-ETH'}]
+# Canned /v1/ticker rows, trimmed to the fields get_all_tickers reads
+TICKERS = {
+    'KRW-BTC': {'market': 'KRW-BTC', 'trade_price': 140000000.0,
+                'acc_trade_volume_24h': 12.5, 'acc_trade_price_24h': 1750000000.0},
+    'BTC-XRP': {'market': 'BTC-XRP', 'trade_price': 0.00001,
+                'acc_trade_volume_24h': 300000.0, 'acc_trade_price_24h': 3.0},
+    'USDT-ETH': {'market': 'USDT-ETH', 'trade_price': 2000.0,
+                 'acc_trade_volume_24h': 4.0, 'acc_trade_price_24h': 8000.0},
+}
+
+
+def _exchange():
+    exchange = UpbitExchange('', '')
+
+    async def make_request(method, endpoint, params=None, signed=False):
+        if endpoint == '/v1/market/all':
+            return MARKETS
+        markets = params['markets'].split(',')
+        if markets == ['KRW-USDT']:
+            return [{'market': 'KRW-USDT', 'trade_price': KRW_PER_USDT}]
+        return [TICKERS[market] for market in markets]
+
+    exchange._make_request = make_request
+    return exchange
+
+
+def test_get_all_tickers_returns_stream_symbols_in_usd():
+    tickers = {ticker['symbol']: ticker for ticker in asyncio.run(_exchange().get_all_tickers())}
+
+    assert set(tickers) == {'BTCUSDT', 'XRPBTC', 'USDT-ETH'}
+    for ticker in tickers.values():
+        assert set(ticker) == {'symbol', 'volume', 'quoteVolume', 'lastPrice'}
+
+    # KRW market: prices converted to USD, base volume untouched
+    assert math.isclose(tickers['BTCUSDT']['lastPrice'], 100000.0)
+    assert math.isclose(tickers['BTCUSDT']['quoteVolume'], 1250000.0)
+    assert tickers['BTCUSDT']['volume'] == 12.5
+    # Non-KRW markets pass through unchanged
+    assert tickers['XRPBTC'] == {'symbol': 'XRPBTC', 'volume': 300000.0, 'quoteVolume': 3.0, 'lastPrice': 0.00001}
+    assert tickers['USDT-ETH']['lastPrice'] == 2000.0
+
+
+def test_main_ticker_spec_reads_get_all_tickers_shape():
+    book = main_module.TickerBook(main_module._TICKER_SPECS['upbit'])
+    book.update(asyncio.run(_exchange().get_all_tickers()))
+
+    row = book.index['BTCUSDT']
+    assert math.isclose(book.buy[row], 100000.0)
+    assert math.isclose(book.sell[row], 100000.0)
+    assert book.volume[row] == 12.5
+
+
+def test_get_all_tickers_returns_empty_list_on_failure():
+    exchange = UpbitExchange('', '')
+
+    async def make_request(method, endpoint, params=None, signed=False):
+        raise RuntimeError('boom')
+
+    exchange._make_request = make_request
+    assert asyncio.run(exchange.get_all_tickers()) == []